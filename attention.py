@@ -0,0 +1,168 @@
+import numpy as np
+
+
+class AttentionWindow:
+    """Rolling attention metrics over a preallocated ring of face observations
+
+    Every analysed frame adds one sample (timestamp, face centre, face size,
+    whether a face was seen) to fixed-size NumPy arrays, so steady-state
+    tracking allocates nothing per sample. metrics() looks at the samples of
+    the last `window` seconds with vectorized operations:
+
+    - smoothed_offset: time-weighted mean distance of the face centre from
+      the focus point over the last `smoothing` seconds (None if no face)
+    - dwell_outside: how long the face has been continuously outside the zone
+    - missing_ratio: share of the window with no face visible
+    - velocity: mean speed of the face centre in pixels per second
+
+    Session totals for reports are kept as running sums updated in push(),
+    so report() is O(1) however long the exam has been running.
+    """
+
+    def __init__(self, capacity=1024, window=5.0, smoothing=0.5, center=(400, 300),
+                 zone=(200, 150, 600, 450), max_gap=1.0):
+        self.capacity = capacity
+        self.window = window
+        self.smoothing = smoothing
+        self.center = center
+        self.zone = zone
+        # Longer gaps between samples (paused pipeline) are not counted as observed time
+        self.max_gap = max_gap
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.xs = np.zeros(capacity, dtype=np.float32)
+        self.ys = np.zeros(capacity, dtype=np.float32)
+        self.sizes = np.zeros(capacity, dtype=np.float32)
+        self.present = np.zeros(capacity, dtype=bool)
+        self._order = np.zeros(capacity, dtype=np.intp)
+        self._steps = np.arange(capacity, dtype=np.intp)
+        self.next = 0
+        self.count = 0
+
+        self.samples = 0
+        self.observed_seconds = 0.0
+        self.missing_seconds = 0.0
+        self.outside_seconds = 0.0
+        self.offset_seconds = 0.0
+        self.peak_velocity = 0.0
+        self.longest_outside = 0.0
+        self._outside_since = None
+
+    def _outside(self, x, y):
+        x0, y0, x1, y1 = self.zone
+        return not (x0 <= x <= x1 and y0 <= y <= y1)
+
+    def push(self, now, box):
+        """Record one frame's result; `box` is the face (x, y, w, h) or None"""
+        last = (self.next - 1) % self.capacity
+        if self.count:
+            gap = now - float(self.times[last])
+            if 0 < gap <= self.max_gap:
+                self._accumulate(last, gap, now)
+
+        i = self.next
+        self.times[i] = now
+        if box is None:
+            self.present[i] = False
+        else:
+            x, y, w, h = box
+            self.xs[i], self.ys[i] = x + w / 2.0, y + h / 2.0
+            self.sizes[i] = w
+            self.present[i] = True
+        self.next = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.samples += 1
+
+        outside = box is not None and self._outside(x + w / 2.0, y + h / 2.0)
+        if outside and self._outside_since is None:
+            self._outside_since = now
+        elif not outside and self._outside_since is not None:
+            self.longest_outside = max(self.longest_outside, now - self._outside_since)
+            self._outside_since = None
+
+    def _accumulate(self, last, gap, now):
+        """Add the interval since the previous sample to the session totals"""
+        self.observed_seconds += gap
+        if not self.present[last]:
+            self.missing_seconds += gap
+            return
+        x, y = float(self.xs[last]), float(self.ys[last])
+        self.offset_seconds += ((x - self.center[0]) ** 2 + (y - self.center[1]) ** 2) ** 0.5 * gap
+        if self._outside(x, y):
+            self.outside_seconds += gap
+
+    def _recent(self, now, seconds):
+        """Ring indices of the samples from the last `seconds`, oldest first"""
+        if not self.count:
+            return self._order[:0]
+        order = self._order[:self.count]
+        np.add(self._steps[:self.count], self.next - self.count, out=order)
+        np.mod(order, self.capacity, out=order)
+        start = np.searchsorted(self.times[order], now - seconds, side="left")
+        return order[start:]
+
+    def _weights(self, order, now):
+        """How long each sample stood, i.e. until the next one (or now)"""
+        times = self.times[order]
+        weights = np.empty(len(order), dtype=np.float64)
+        weights[:-1] = np.diff(times)
+        weights[-1] = now - times[-1]
+        return np.minimum(weights, self.max_gap, out=weights)
+
+    def metrics(self, now):
+        order = self._recent(now, self.window)
+        metrics = {"smoothed_offset": None, "dwell_outside": 0.0, "missing_ratio": 0.0, "velocity": 0.0}
+        if not len(order):
+            return metrics
+
+        weights = self._weights(order, now)
+        present = self.present[order]
+        total = weights.sum()
+        if total > 0:
+            metrics["missing_ratio"] = float(weights[~present].sum() / total)
+        elif not present[-1]:
+            metrics["missing_ratio"] = 1.0
+
+        xs, ys = self.xs[order], self.ys[order]
+        offsets = np.hypot(xs - self.center[0], ys - self.center[1])
+        recent = present & (self.times[order] >= now - self.smoothing)
+        if recent.any():
+            recent_weights = np.maximum(weights[recent], 1e-3)
+            metrics["smoothed_offset"] = float(np.average(offsets[recent], weights=recent_weights))
+
+        # Consecutive pairs with a face in both frames give the movement speed
+        both = present[1:] & present[:-1]
+        if both.any():
+            dt = np.diff(self.times[order])[both]
+            moved = np.hypot(np.diff(xs)[both], np.diff(ys)[both])
+            valid = dt > 0
+            if valid.any():
+                metrics["velocity"] = float(moved[valid].sum() / dt[valid].sum())
+                self.peak_velocity = max(self.peak_velocity, metrics["velocity"])
+
+        if self._outside_since is not None:
+            metrics["dwell_outside"] = now - self._outside_since
+        return metrics
+
+    def report(self):
+        """Whole-session attention figures for summaries and exported reports"""
+        observed = self.observed_seconds
+        seen = observed - self.missing_seconds
+        longest = self.longest_outside
+        if self._outside_since is not None:
+            longest = max(longest, float(self.times[(self.next - 1) % self.capacity]) - self._outside_since)
+        return {
+            "observed_seconds": observed,
+            "face_missing_pct": self.missing_seconds / observed * 100 if observed else 0.0,
+            "outside_zone_pct": self.outside_seconds / observed * 100 if observed else 0.0,
+            "mean_offset_px": self.offset_seconds / seen if seen > 0 else 0.0,
+            "longest_outside_seconds": longest,
+            "peak_velocity_px_s": self.peak_velocity,
+        }
+
+    def describe(self):
+        report = self.report()
+        return (f"Observed {report['observed_seconds'] / 60:.1f} min; face missing "
+                f"{report['face_missing_pct']:.1f}% of the time, outside the focus zone "
+                f"{report['outside_zone_pct']:.1f}% (longest stretch "
+                f"{report['longest_outside_seconds']:.1f}s); mean offset from centre "
+                f"{report['mean_offset_px']:.0f}px, peak head movement {report['peak_velocity_px_s']:.0f}px/s")
@@ -0,0 +1,584 @@
+"""Headless benchmarks for GTCD components
+
+Each subcommand prints one JSON object so results can be stored and diffed
+across commits, e.g.
+
+    python benchmark.py journal --events 2000000 > journal.json
+    python benchmark.py analyze --video clip.mp4 --baseline analyze.json
+    python benchmark.py detectors --video clip.mp4 --labels clip.csv
+    python benchmark.py startup --launch dist/GTCD/GTCD.exe --runs 5
+
+With --baseline, metrics that got worse by more than --tolerance are listed
+under "regressions" and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    """Latency summary in milliseconds from a list of durations in seconds"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    summary = {f"p{p}_ms": ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1000
+               for p in points}
+    summary["mean_ms"] = sum(ordered) / len(ordered) * 1000
+    summary["max_ms"] = ordered[-1] * 1000
+    return summary
+
+
+class Timed:
+    """Wraps a callable and keeps the duration of every call"""
+
+    def __init__(self, func):
+        self.func = func
+        self.samples = []
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            self.samples.append(time.perf_counter() - start)
+
+
+def synthetic_frames(count, width, height, seed=0):
+    """Noisy frames with a bright face-sized blob drifting across the focus zone"""
+    import numpy as np
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    background = rng.integers(0, 60, (height, width, 3), dtype=np.uint8)
+    for i in range(count):
+        frame = background.copy()
+        cx = int(width / 2 + width / 4 * np.sin(i / 25))
+        cy = int(height / 2 + height / 8 * np.cos(i / 40))
+        cv2.ellipse(frame, (cx, cy), (width // 12, height // 8), 0, 0, 360, (170, 190, 220), -1)
+        yield frame
+
+
+def video_frames(path, limit=None, loop=False):
+    import cv2
+
+    produced = 0
+    while True:
+        capture = cv2.VideoCapture(path)
+        if not capture.isOpened():
+            raise SystemExit(f"Cannot open video: {path}")
+        got_any = False
+        while limit is None or produced < limit:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            got_any = True
+            produced += 1
+            yield frame
+        capture.release()
+        if not loop or not got_any or (limit is not None and produced >= limit):
+            return
+
+
+def bench_analyze(args):
+    """Per-stage latency, sustained FPS and CPU time of analyze_behavior with no GUI"""
+    from proctor import GoogolCheatingDetectorAI
+    from sinks import MemorySink
+
+    sink = MemorySink()
+    proctor = GoogolCheatingDetectorAI(sinks=[sink], monitor_inputs=False, track_faces=not args.no_track,
+                                       rescan_interval=args.rescan_interval, detector=args.detector,
+                                       motion_gate=not args.no_motion_gate,
+                                       motion_threshold=args.motion_threshold)
+    detect = proctor.tracker.detect = Timed(proctor.tracker.detect)
+    score = proctor.episodes.update = Timed(proctor.episodes.update)
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    if args.video:
+        frames = video_frames(args.video, limit=args.frames + args.warmup, loop=args.loop)
+    else:
+        frames = synthetic_frames(args.frames + args.warmup, width, height)
+
+    totals = []
+    # Per-frame detection time, 0 when the motion gate reused the previous result
+    detect_times = []
+    processed = 0
+    wall_start = cpu_start = None
+    for frame in frames:
+        if processed == args.warmup:
+            detect.samples.clear()
+            score.samples.clear()
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+        detections = len(detect.samples)
+        start = time.perf_counter()
+        proctor.analyze_behavior(frame)
+        if processed >= args.warmup:
+            totals.append(time.perf_counter() - start)
+            detect_times.append(detect.samples[-1] if len(detect.samples) > detections else 0.0)
+        processed += 1
+    if wall_start is None:
+        raise SystemExit("Not enough frames for the requested warmup")
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    measured = len(totals)
+
+    other = [t - d - e for t, d, e in zip(totals, detect_times, score.samples)]
+    return {
+        "source": args.video or f"synthetic {width}x{height}",
+        "frames": measured,
+        "detector": args.detector,
+        "tracking": not args.no_track,
+        "rescan_interval": args.rescan_interval,
+        "sustained_fps": measured / wall if wall else 0.0,
+        "cpu_ms_per_frame": cpu / measured * 1000 if measured else 0.0,
+        "stages": {
+            "analyze_total": percentiles(totals),
+            "face_detect": percentiles(detect.samples),
+            "episode_scoring": percentiles(score.samples),
+            "preprocess_and_draw": percentiles(other),
+        },
+        "face_tracker": proctor.tracker.stats(),
+        "motion_gate": proctor.gate.stats() if proctor.gate else {},
+        "log_events": len(sink.store),
+        "episodes": len(proctor.episodes.episodes),
+    }
+
+
+def bench_streams(args):
+    """Multi-stream throughput for 1..N worker processes and streams per core"""
+    from multistream import MultiStreamProctor
+
+    max_workers = args.max_workers or os.cpu_count() or 1
+    sources = [f"synthetic:{args.size}"] * args.streams if not args.video else \
+        [args.video] * args.streams
+    runs = []
+    for workers in range(1, max_workers + 1):
+        proctor = MultiStreamProctor(sources, workers=workers, stream_fps=args.stream_fps)
+        results = proctor.run(args.duration)
+        frames = sum(s["frames"] for r in results.values() for s in r["streams"].values())
+        wall = max((r["wall_seconds"] for r in results.values()), default=0.0)
+        cpu = sum(r["cpu_seconds"] for r in results.values())
+        total_fps = frames / wall if wall else 0.0
+        per_stream = [s["fps"] for r in results.values() for s in r["streams"].values()]
+        runs.append({
+            "workers": workers,
+            "total_fps": total_fps,
+            "min_stream_fps": min(per_stream, default=0.0),
+            "max_stream_fps": max(per_stream, default=0.0),
+            "cpu_ms_per_frame": cpu / frames * 1000 if frames else 0.0,
+            # How many streams one core sustains at the target per-stream rate
+            "streams_per_core": total_fps / args.target_fps / workers if args.target_fps else 0.0,
+            "events_routed": proctor.routed,
+        })
+    return {
+        "streams": args.streams,
+        "source": args.video or f"synthetic {args.size}",
+        "target_fps": args.target_fps,
+        "runs": runs,
+        "scaling_efficiency": (runs[-1]["total_fps"] / (runs[0]["total_fps"] * len(runs))
+                               if runs and runs[0]["total_fps"] else 0.0),
+    }
+
+
+def bench_report(args):
+    """Report PDF rendering time, size and peak Python memory for a synthetic session"""
+    import tracemalloc
+    from events import EventStore
+    from report import ReportJob
+
+    store = EventStore()
+    kinds = [("INFO", "Window focus: Visual Studio Code - exam.py"), ("WARNING", "Looking away"),
+             ("AI ALERT", "LLM access attempt detected!"), ("CHEAT", "AI MODEL detected: ChatGPT")]
+    now = time.time() - args.events * args.interval
+    for i in range(args.events):
+        event_type, message = kinds[(i * 7 + i // 13) % len(kinds)]
+        store.append(event_type, f"{message} #{i % 97}", timestamp=now + i * args.interval)
+
+    directory = tempfile.mkdtemp(prefix="gtcd_report_")
+    try:
+        def render():
+            job = ReportJob(os.path.join(directory, "report.pdf"), store, summary="**Summary**\n- Synthetic")
+            job.start().wait()
+            if job.state != job.DONE:
+                raise RuntimeError(f"Report {job.state}: {job.error}")
+            return job.stats()
+
+        stats = render()
+        # tracemalloc slows rendering several times over, so memory is measured on a second run
+        tracemalloc.start()
+        render()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {
+            "events": args.events,
+            "pages": stats["pages"],
+            "rows": stats["rows"],
+            "omitted_rows": stats["omitted_rows"],
+            "render_seconds": stats["seconds"],
+            "render_events_per_sec": args.events / stats["seconds"],
+            "pdf_bytes": stats["bytes"],
+            "peak_traced_bytes": peak,
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def bench_search(args):
+    """Event index build time and filtered/word query latency over a large synthetic session"""
+    from events import EventStore, ALERT, CRITICAL
+    from search import EventIndex
+
+    store = EventStore()
+    apps = ["Google Chrome", "Visual Studio Code", "Slack", "Notepad", "Firefox"]
+    start_time = time.time() - args.events * args.interval
+    for i in range(args.events):
+        kind = i % 5
+        if kind == 0:
+            event_type, message = "WINDOW", f"Switched to {apps[i % 7 % 5]} tab {i % 300}"
+        elif kind == 1:
+            event_type, message = "CHEAT", "AI MODEL detected: ChatGPT - Google Chrome"
+        elif kind == 2:
+            event_type, message = "AI ALERT", "LLM access attempt detected!"
+        else:
+            event_type, message = "INFO", f"Looking away offset {i % 500}px"
+        store.append(event_type, message, timestamp=start_time + i * args.interval)
+
+    index = EventIndex(store)
+    started = time.perf_counter()
+    index.update()
+    build = time.perf_counter() - started
+
+    span = args.events * args.interval
+    queries = {
+        "critical": {"severities": [CRITICAL]},
+        "alerts_and_above": {"severities": range(ALERT, CRITICAL + 1)},
+        "window_chrome_15min": {"text": "chrome", "event_types": ["WINDOW"],
+                                "since": start_time + span / 2, "until": start_time + span / 2 + 900},
+        "prefix_word": {"text": "chrom"},
+        "four_words": {"text": "switched to chrome tab "},
+        "type_and_message_words": {"text": "alert attempt"},
+    }
+    results = {}
+    for name, query in queries.items():
+        timer = Timed(index.query)
+        for _ in range(args.repeat):
+            matches = timer(**query)
+        results[name] = dict(percentiles(timer.samples, (50, 90)), matches=len(matches))
+    stats = index.stats()
+    return {
+        "events": args.events,
+        "build_seconds": build,
+        "build_events_per_sec": args.events / build if build else 0.0,
+        "index_bytes": stats["index_bytes"],
+        "words": stats["words"],
+        "queries": results,
+    }
+
+
+def bench_startup(args):
+    """Launch-to-window, camera and first painted frame, over several cold starts"""
+    if args.launch:
+        # Quoted paths with spaces stay one argument; non-POSIX mode keeps Windows backslashes
+        command = [part.strip('"') for part in shlex.split(args.launch, posix=False)]
+    else:
+        command = [sys.executable, "main.py"]
+    here = os.path.dirname(os.path.abspath(__file__))
+    marks = {}
+    failures = 0
+    for _ in range(args.runs):
+        # A file rather than stdout, which windowed builds do not have
+        fd, probe = tempfile.mkstemp(suffix=".txt")
+        os.close(fd)
+        launched = time.time()
+        try:
+            subprocess.run(command + ["--startup-probe", probe], capture_output=True,
+                           timeout=args.timeout, cwd=here)
+            with open(probe) as f:
+                output = f.read()
+        except (subprocess.TimeoutExpired, OSError):
+            output = ""
+        finally:
+            os.remove(probe)
+        line = next((l for l in output.splitlines() if l.startswith("GTCD_STARTUP ")), None)
+        if line is None:
+            failures += 1
+            continue
+        for mark, at in json.loads(line.split(" ", 1)[1]).items():
+            marks.setdefault(mark, []).append(at - launched)
+    result = {"command": " ".join(command), "runs": args.runs, "failed_runs": failures}
+    for mark, samples in marks.items():
+        samples.sort()
+        # Medians keep one slow cold start (disk cache, antivirus scan) from dominating
+        result[mark] = {"median_seconds": samples[len(samples) // 2],
+                        "min_seconds": samples[0], "max_seconds": samples[-1]}
+    return result
+
+
+def read_labels(path):
+    """Ground truth for a clip: {frame index: (x, y, w, h) or None}
+
+    One CSV line per labelled frame, "frame,x,y,w,h" in 800x600 analysis
+    coordinates; a frame with no face is just "frame". Other lines are ignored.
+    """
+    labels = {}
+    with open(path) as f:
+        for line in f:
+            parts = [part.strip() for part in line.split(",")]
+            if not parts[0].isdigit():
+                continue
+            box = tuple(int(float(v)) for v in parts[1:5]) if len(parts) >= 5 and parts[1] else None
+            labels[int(parts[0])] = box
+    return labels
+
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    overlap_w = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    overlap_h = max(0, min(ay + ah, by + bh) - max(ay, by))
+    overlap = overlap_w * overlap_h
+    union = aw * ah + bw * bh - overlap
+    return overlap / union if union else 0.0
+
+
+def bench_detectors(args):
+    """Accuracy against speed of each face detector backend on a recorded clip"""
+    import cv2
+    from detectors import create_detector
+
+    labels = read_labels(args.labels) if args.labels else None
+    width, height = (int(v) for v in args.dnn_size.lower().split("x"))
+    backends = {}
+    for name in args.backends.split(","):
+        options = {"threads": args.threads}
+        if name == "dnn":
+            options.update(input_size=(width, height), confidence=args.confidence)
+        elif name == "haar" and args.haar_width:
+            options["detect_width"] = args.haar_width
+        detect = Timed(create_detector(name, **options).detect)
+
+        frames = found = true_pos = false_pos = false_neg = 0
+        cpu_start = time.process_time()
+        for index, frame in enumerate(video_frames(args.video, limit=args.frames)):
+            # Same preprocessing as analyze_behavior
+            frame = cv2.resize(frame, (800, 600))
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            faces = detect(gray, frame)
+            frames += 1
+            found += bool(faces)
+            if labels is None or index not in labels:
+                continue
+            truth, best = labels[index], faces[0] if faces else None
+            if truth is None:
+                false_pos += best is not None
+            elif best is None:
+                false_neg += 1
+            elif iou(best, truth) >= args.iou:
+                true_pos += 1
+            else:
+                false_pos += 1
+                false_neg += 1
+        cpu = time.process_time() - cpu_start
+
+        spent = sum(detect.samples)
+        result = {
+            "frames": frames,
+            "detect_fps": frames / spent if spent else 0.0,
+            "cpu_ms_per_frame": cpu / frames * 1000 if frames else 0.0,
+            "latency": percentiles(detect.samples),
+            "face_found_ratio": found / frames if frames else 0.0,
+        }
+        if labels is not None:
+            precision = true_pos / (true_pos + false_pos) if true_pos + false_pos else 0.0
+            recall = true_pos / (true_pos + false_neg) if true_pos + false_neg else 0.0
+            result.update({
+                "labelled_frames": sum(1 for index in labels if index < frames),
+                "precision": precision,
+                "recall": recall,
+                "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+            })
+        backends[name] = result
+    return {"source": args.video, "labels": args.labels, "backends": backends}
+
+
+def flatten(result, prefix=""):
+    flat = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(result, baseline, tolerance):
+    """Metrics that moved the wrong way by more than `tolerance` (a fraction)"""
+    regressions = []
+    current, previous = flatten(result), flatten(baseline)
+    for key, old in previous.items():
+        new = current.get(key)
+        if new is None or not old:
+            continue
+        name = key.rsplit(".", 1)[-1]
+        if name.endswith("_ms") or name.endswith("seconds"):
+            change = (new - old) / old
+        elif name.endswith("per_sec") or name.endswith("fps"):
+            change = (old - new) / old
+        else:
+            continue
+        if change > tolerance:
+            regressions.append({"metric": key, "baseline": old, "current": new,
+                                "worse_by": round(change, 4)})
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def bench_journal(args):
+    """Sustained journal write throughput and replay time into a fresh EventStore"""
+    from events import EventStore
+    from journal import SessionJournal
+
+    directory = tempfile.mkdtemp(prefix="gtcd-journal-")
+    try:
+        store = EventStore()
+        journal = SessionJournal(directory, segment_bytes=args.segment_mb * 1024 * 1024,
+                                 fsync=not args.no_fsync)
+        store.subscribe(journal.record)
+        messages = ["Significant attention deviation detected!", "LLM access attempt detected!",
+                    "SWITCHED TO AI MODEL-CHAT GPT!!"] + [f"Window changed to: Tab {i}" for i in range(50)]
+        types = ["CHEAT DETECTED", "AI ALERT", "CRITICAL ALERT", "WARNING"]
+
+        start = time.perf_counter()
+        for i in range(args.events):
+            store.append(types[i % 4], messages[i % len(messages)])
+        produced = time.perf_counter() - start
+        journal.close()
+        written = time.perf_counter() - start
+
+        start = time.perf_counter()
+        recovered = EventStore()
+        restored = SessionJournal.recover(directory, recovered)
+        recovery = time.perf_counter() - start
+
+        return {
+            "events": args.events,
+            "fsync": not args.no_fsync,
+            "producer_seconds": produced,
+            "producer_events_per_sec": args.events / produced,
+            "write_seconds": written,
+            "write_events_per_sec": args.events / written,
+            "bytes_written": journal.bytes_written,
+            "batches": journal.batches,
+            "segments": len(SessionJournal.segments(directory)),
+            "recovery_seconds": recovery,
+            "recovery_events_per_sec": restored / recovery if recovery else 0.0,
+            "recovered_events": restored,
+            "recovered_alerts": recovered.alert_count,
+            "consistent": restored == args.events and recovered.alert_count == store.alert_count,
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    journal = sub.add_parser("journal", help=bench_journal.__doc__)
+    journal.add_argument("--events", type=int, default=1_000_000)
+    journal.add_argument("--segment-mb", type=int, default=8)
+    journal.add_argument("--no-fsync", action="store_true")
+    journal.set_defaults(run=bench_journal)
+
+    analyze = sub.add_parser("analyze", help=bench_analyze.__doc__)
+    analyze.add_argument("--video", help="video file to replay; synthetic frames when omitted")
+    analyze.add_argument("--loop", action="store_true", help="restart the video until --frames is reached")
+    analyze.add_argument("--frames", type=int, default=300)
+    analyze.add_argument("--warmup", type=int, default=20)
+    analyze.add_argument("--size", default="1280x720", help="synthetic frame size")
+    analyze.add_argument("--no-track", action="store_true", help="full-frame Haar scan on every frame")
+    analyze.add_argument("--rescan-interval", type=int, default=15)
+    analyze.add_argument("--detector", default="haar", help="face detector backend")
+    analyze.add_argument("--no-motion-gate", action="store_true", help="detect faces on every frame")
+    analyze.add_argument("--motion-threshold", type=float, default=4.0)
+    analyze.set_defaults(run=bench_analyze)
+
+    detectors = sub.add_parser("detectors", help=bench_detectors.__doc__)
+    detectors.add_argument("--video", required=True, help="recorded clip to run every backend on")
+    detectors.add_argument("--labels", help="CSV ground truth (frame,x,y,w,h) for precision/recall")
+    detectors.add_argument("--frames", type=int, help="stop after this many frames")
+    detectors.add_argument("--backends", default="haar,dnn", help="comma-separated backend names")
+    detectors.add_argument("--threads", type=int, help="OpenCV worker threads")
+    detectors.add_argument("--dnn-size", default="300x300", help="cv2.dnn input resolution")
+    detectors.add_argument("--confidence", type=float, default=0.5, help="cv2.dnn score threshold")
+    detectors.add_argument("--haar-width", type=int, help="downscale frames to this width for Haar")
+    detectors.add_argument("--iou", type=float, default=0.5, help="overlap counted as a correct detection")
+    detectors.set_defaults(run=bench_detectors)
+
+    streams = sub.add_parser("streams", help=bench_streams.__doc__)
+    streams.add_argument("--streams", type=int, default=8)
+    streams.add_argument("--video", help="video file used for every stream; synthetic when omitted")
+    streams.add_argument("--size", default="640x480", help="synthetic frame size")
+    streams.add_argument("--duration", type=float, default=10, help="seconds per worker count")
+    streams.add_argument("--max-workers", type=int)
+    streams.add_argument("--stream-fps", type=float, default=0,
+                         help="per-stream cap while measuring (0 = as fast as possible)")
+    streams.add_argument("--target-fps", type=float, default=10,
+                         help="per-stream rate used to express capacity as streams per core")
+    streams.set_defaults(run=bench_streams)
+
+    startup = sub.add_parser("startup", help=bench_startup.__doc__)
+    startup.add_argument("--launch", help="how to launch the app (default: this Python running main.py), "
+                                          "e.g. dist/GTCD/GTCD.exe for a packaged build")
+    startup.add_argument("--runs", type=int, default=5)
+    startup.add_argument("--timeout", type=float, default=120, help="seconds before a run counts as failed")
+    startup.set_defaults(run=bench_startup)
+
+    report = sub.add_parser("report", help=bench_report.__doc__)
+    report.add_argument("--events", type=int, default=200_000)
+    report.add_argument("--interval", type=float, default=0.05, help="seconds between synthetic events")
+    report.set_defaults(run=bench_report)
+
+    search = sub.add_parser("search", help=bench_search.__doc__)
+    search.add_argument("--events", type=int, default=2_000_000)
+    search.add_argument("--interval", type=float, default=0.01, help="seconds between synthetic events")
+    search.add_argument("--repeat", type=int, default=20, help="runs of each query")
+    search.set_defaults(run=bench_search)
+
+    for command in (journal, analyze, detectors, streams, startup, report, search):
+        command.add_argument("--baseline", help="earlier JSON result to compare against")
+        command.add_argument("--tolerance", type=float, default=0.15)
+
+    args = parser.parse_args(argv)
+    result = {
+        "benchmark": args.command,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.time(),
+    }
+    result.update(args.run(args))
+    if args.baseline:
+        with open(args.baseline) as f:
+            result["regressions"] = compare(result, json.load(f), args.tolerance)
+    json.dump(result, sys.stdout, indent=2)
+    print()
+    return 1 if result.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
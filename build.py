@@ -1,7 +1,15 @@
 import PyInstaller.__main__
+import argparse
 import os
 import shutil
 
+parser = argparse.ArgumentParser()
+# --onefile unpacks the whole bundle to a temp folder on every launch; a
+# folder build starts straight away, and skipping UPX avoids decompressing DLLs
+parser.add_argument("--fast", action="store_true",
+                    help="build dist/GTCD/ as a folder (no per-launch unpacking) instead of one .exe")
+args = parser.parse_args()
+
 # Clean previous builds
 if os.path.exists('dist'):
     shutil.rmtree('dist')
@@ -11,7 +19,7 @@ if os.path.exists('build'):
 # Build the executable
 PyInstaller.__main__.run([
     'main_for_build.py',
-    '--onefile',
+    *(['--onedir', '--noupx'] if args.fast else ['--onefile']),
     '--windowed',
     '--icon=gtcd.ico',
     '--name=GTCD',
@@ -32,6 +40,8 @@ PyInstaller.__main__.run([
     # OpenCV specific fixes
     '--collect-data=cv2',
     '--collect-data=google',
+    # Face detection models for the cv2.dnn backend (see models/README.md)
+    '--add-data=models;models',
     # Path to your Python installation
     '--paths=C:\\Users\\prana\\AppData\\Local\\Programs\\Python\\Python313\\Lib\\site-packages'
 ])
\ No newline at end of file
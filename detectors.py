@@ -0,0 +1,129 @@
+import os
+import sys
+
+import cv2
+
+
+def model_path(name):
+    """Path of a file under models/, also inside a PyInstaller bundle"""
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, "models", name)
+
+
+def set_threads(threads):
+    """OpenCV's worker thread count (process-wide); None leaves the default"""
+    if threads is not None:
+        cv2.setNumThreads(int(threads))
+
+
+class FaceDetector:
+    """Finds faces in an 8-bit image
+
+    detect(gray, frame=None, min_size=None, max_size=None) returns boxes as
+    (x, y, w, h) in the coordinates of `gray`, most confident first. `frame`
+    is the same image in BGR when the caller has it. Backends that can search
+    a small region cheaply set `supports_roi`, which lets FaceTracker search
+    around the previous face instead of the whole frame.
+    """
+
+    name = "none"
+    supports_roi = False
+
+    def detect(self, gray, frame=None, min_size=None, max_size=None):
+        return []
+
+
+class HaarDetector(FaceDetector):
+    """OpenCV Haar cascade (the original detector)
+
+    `detect_width` shrinks wide images to that many pixels before the
+    cascade runs, trading small-face recall for speed; boxes are scaled back.
+    """
+
+    name = "haar"
+    supports_roi = True
+
+    def __init__(self, cascade="haarcascade_frontalface_default.xml", scale_factor=1.1,
+                 min_neighbors=5, detect_width=None, threads=None):
+        set_threads(threads)
+        path = cascade if os.path.exists(cascade) else cv2.data.haarcascades + cascade
+        self.cascade = cv2.CascadeClassifier(path)
+        if self.cascade.empty():
+            raise ValueError(f"Cannot load Haar cascade: {cascade}")
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.detect_width = detect_width
+
+    def detect(self, gray, frame=None, min_size=None, max_size=None):
+        scale = 1.0
+        if self.detect_width and gray.shape[1] > self.detect_width:
+            scale = self.detect_width / float(gray.shape[1])
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        options = {}
+        if min_size:
+            options["minSize"] = (max(1, int(min_size * scale)),) * 2
+        if max_size:
+            options["maxSize"] = (int(max_size * scale) + 1,) * 2
+        found = self.cascade.detectMultiScale(gray, self.scale_factor, self.min_neighbors, **options)
+        return [tuple(int(v / scale) for v in face) for face in found]
+
+
+class DnnDetector(FaceDetector):
+    """ResNet-10 SSD face detector run on the CPU through cv2.dnn
+
+    Much better than the frontal Haar cascade on turned and tilted heads, and
+    its cost depends on `input_size`, not on the camera resolution. Loads
+    models/deploy.prototxt and the matching Caffe weights (see models/README.md).
+    """
+
+    name = "dnn"
+
+    def __init__(self, prototxt="deploy.prototxt", weights="res10_300x300_ssd_iter_140000_fp16.caffemodel",
+                 input_size=(300, 300), confidence=0.5, threads=None):
+        set_threads(threads)
+        prototxt = prototxt if os.path.exists(prototxt) else model_path(prototxt)
+        weights = weights if os.path.exists(weights) else model_path(weights)
+        for path in (prototxt, weights):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Face detection model not found: {path} (see models/README.md)")
+        self.net = cv2.dnn.readNetFromCaffe(prototxt, weights)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        self.input_size = tuple(input_size)
+        self.confidence = confidence
+
+    def detect(self, gray, frame=None, min_size=None, max_size=None):
+        image = frame if frame is not None else cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+        height, width = image.shape[:2]
+        blob = cv2.dnn.blobFromImage(cv2.resize(image, self.input_size), 1.0, self.input_size,
+                                     (104.0, 177.0, 123.0))
+        self.net.setInput(blob)
+        detections = self.net.forward()[0, 0]
+
+        faces = []
+        for _, _, score, x0, y0, x1, y1 in detections:
+            if score < self.confidence:
+                continue
+            x0, y0 = max(0, int(x0 * width)), max(0, int(y0 * height))
+            x1, y1 = min(width, int(x1 * width)), min(height, int(y1 * height))
+            w, h = x1 - x0, y1 - y0
+            if w <= 0 or h <= 0 or (min_size and w < min_size) or (max_size and w > max_size):
+                continue
+            faces.append((score, (x0, y0, w, h)))
+        faces.sort(key=lambda f: -f[0])
+        return [box for _, box in faces]
+
+
+DETECTORS = {
+    "haar": HaarDetector,
+    "dnn": DnnDetector,
+}
+
+
+def create_detector(name="haar", **options):
+    """Instantiate a backend from DETECTORS by name"""
+    try:
+        backend = DETECTORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown face detector '{name}' (choose from {', '.join(DETECTORS)})")
+    return backend(**options)
@@ -0,0 +1,129 @@
+import time
+import tkinter as tk
+from threading import Lock
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+from metrics import registry
+
+PAINT_SECONDS = registry.histogram("gtcd_display_paint_seconds",
+                                   "Tk thread time to convert and paint one video frame")
+DISPLAY_STATS = registry.gauge("gtcd_display", "Video display paints, skips and buffer allocations",
+                               labels=("counter",))
+
+
+class FrameDisplay:
+    """Shows the newest frame in a Tk label through one reused image
+
+    submit() may be called from any thread and only stores a reference to
+    the frame. A timer on the Tk thread paints at most `fps` times a second:
+    the BGR frame is converted into a preallocated RGBA buffer, wrapped by a
+    PIL image that shares that buffer (RGBA is a layout PIL can map without
+    copying, unlike packed RGB), and pasted into the same PhotoImage
+    every time, so steady-state painting allocates no new image objects.
+    Ticks with no new frame, or whose frame looks identical to the last one
+    painted, are skipped. While running, stats() is exported as
+    gtcd_display gauges on every metrics scrape.
+    """
+
+    def __init__(self, label, fps=30, size=(800, 600)):
+        self.label = label
+        self.period_ms = max(1, int(1000 / fps))
+        self._lock = Lock()
+        self._frame = None
+        self._seq = 0
+        self._painted_seq = 0
+        self._signature = None
+        self._rgba = None
+        self._image = None
+        self._photo = None
+        self.running = False
+
+        self.paints = 0
+        self.skipped_stale = 0
+        self.skipped_unchanged = 0
+        self.render_time = 0.0
+        self.allocations = 0
+        self.allocated_bytes = 0
+        self._allocate(size)
+
+    def _allocate(self, size):
+        width, height = size
+        self._rgba = np.empty((height, width, 4), dtype=np.uint8)
+        self._image = Image.frombuffer("RGBA", (width, height), self._rgba, "raw", "RGBA", 0, 1)
+        self._photo = ImageTk.PhotoImage(self._image)
+        self.label.configure(image=self._photo)
+        self.label.image = self._photo
+        self.allocations += 1
+        self.allocated_bytes += self._rgba.nbytes
+
+    def submit(self, frame):
+        """Hand over the newest frame (any thread); no copy, no Tk calls"""
+        with self._lock:
+            self._frame = frame
+            self._seq += 1
+
+    def start(self):
+        self.running = True
+        registry.collect_with(self.export_metrics)
+        self.label.after(self.period_ms, self._tick)
+
+    def stop(self):
+        self.running = False
+        registry.stop_collecting(self.export_metrics)
+
+    def export_metrics(self):
+        for name, value in self.stats().items():
+            DISPLAY_STATS.labels(name).set(value)
+
+    def _tick(self):
+        if not self.running:
+            return
+        try:
+            self.paint()
+        except tk.TclError:
+            self.running = False
+            return
+        except Exception as e:
+            print(f"Display error: {str(e)}")
+        self.label.after(self.period_ms, self._tick)
+
+    def paint(self):
+        """Repaint from the latest submitted frame if it changed (Tk thread)"""
+        with self._lock:
+            frame, seq = self._frame, self._seq
+        if frame is None or seq == self._painted_seq:
+            self.skipped_stale += 1
+            return False
+        self._painted_seq = seq
+
+        # A sparse sample is enough to notice that nothing on screen changed
+        signature = frame[::24, ::24].copy()
+        if self._signature is not None and np.array_equal(signature, self._signature):
+            self.skipped_unchanged += 1
+            return False
+        self._signature = signature
+
+        start = time.perf_counter()
+        height, width = frame.shape[:2]
+        if self._rgba.shape[:2] != (height, width):
+            self._allocate((width, height))
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=self._rgba)
+        self._photo.paste(self._image)
+        elapsed = time.perf_counter() - start
+        self.render_time += elapsed
+        PAINT_SECONDS.observe(elapsed)
+        self.paints += 1
+        return True
+
+    def stats(self):
+        return {
+            "paints": self.paints,
+            "skipped_stale": self.skipped_stale,
+            "skipped_unchanged": self.skipped_unchanged,
+            "mean_render_ms": self.render_time / self.paints * 1000 if self.paints else 0.0,
+            "buffer_allocations": self.allocations,
+            "allocated_bytes_per_paint": self.allocated_bytes / self.paints if self.paints else 0.0,
+        }
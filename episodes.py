@@ -0,0 +1,84 @@
+class Episode:
+    __slots__ = ("started", "ended", "last_deviation", "peak", "frames", "reported")
+
+    def __init__(self, started, distance):
+        self.started = started
+        self.ended = None
+        self.last_deviation = started
+        self.peak = distance
+        self.frames = 1
+        self.reported = False
+
+    @property
+    def duration(self):
+        return (self.ended if self.ended is not None else self.last_deviation) - self.started
+
+    def describe(self):
+        return (f"Attention deviation lasted {self.duration:.1f}s "
+                f"(peak {self.peak:.0f}px, {self.frames} frames)")
+
+
+class EpisodeTracker:
+    """Coalesces per-frame deviation readings into open/close episodes
+
+    An episode opens once the distance exceeds `open_threshold` and is only
+    reported after it has lasted `min_duration` seconds, which filters out
+    single noisy frames. It stays open until the distance has been back
+    under `close_threshold` for `close_grace` seconds; the gap between the
+    two thresholds is the hysteresis that stops it flapping at the border.
+    """
+
+    def __init__(self, open_threshold=150, close_threshold=120,
+                 min_duration=1.0, close_grace=1.0):
+        self.open_threshold = open_threshold
+        self.close_threshold = close_threshold
+        self.min_duration = min_duration
+        self.close_grace = close_grace
+        self.current = None
+        self.episodes = []
+        self.discarded = 0
+
+    @property
+    def active(self):
+        return self.current is not None
+
+    def update(self, distance, now):
+        """Feed one reading (None when no face was seen)
+
+        Returns ("open", episode) when an episode is first confirmed,
+        ("close", episode) when a reported episode ends, otherwise None.
+        """
+        episode = self.current
+        if episode is None:
+            if distance is not None and distance > self.open_threshold:
+                episode = self.current = Episode(now, distance)
+            else:
+                return None
+        elif distance is not None and distance > self.close_threshold:
+            episode.last_deviation = now
+            episode.frames += 1
+            if distance > episode.peak:
+                episode.peak = distance
+        elif now - episode.last_deviation >= self.close_grace:
+            return self._close(now)
+
+        if not episode.reported and episode.last_deviation - episode.started >= self.min_duration:
+            episode.reported = True
+            return ("open", episode)
+        return None
+
+    def _close(self, now):
+        episode = self.current
+        self.current = None
+        episode.ended = episode.last_deviation
+        if not episode.reported:
+            self.discarded += 1
+            return None
+        self.episodes.append(episode)
+        return ("close", episode)
+
+    def flush(self, now):
+        """Close whatever is open, e.g. when monitoring stops"""
+        if self.current is None:
+            return None
+        return self._close(now)
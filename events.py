@@ -0,0 +1,189 @@
+import time
+from array import array
+from collections import deque
+from threading import Lock
+
+SEVERITIES = ("INFO", "WARNING", "ALERT", "CRITICAL")
+INFO, WARNING, ALERT, CRITICAL = range(len(SEVERITIES))
+
+# Row colours keep the original two-tone log: red for AI-model alerts, amber otherwise
+SEVERITY_COLORS = ("#ffaa00", "#ffaa00", "#ffaa00", "#ff4444")
+
+
+def classify(event_type, message):
+    """Map the free-form event type/message pairs the app logs onto a severity"""
+    if "AI MODEL" in message or "CRITICAL" in event_type:
+        return CRITICAL
+    if "CHEAT" in event_type or "ALERT" in event_type:
+        return ALERT
+    if "WARNING" in event_type or "ERROR" in event_type:
+        return WARNING
+    return INFO
+
+
+def is_alert(event_type, message):
+    """Events that count towards the AI ALERTS counter"""
+    return "AI MODEL" in message or "CHEAT" in event_type
+
+
+class Event:
+    __slots__ = ("index", "timestamp", "event_type", "severity", "message")
+
+    def __init__(self, index, timestamp, event_type, severity, message):
+        self.index = index
+        self.timestamp = timestamp
+        self.event_type = event_type
+        self.severity = severity
+        self.message = message
+
+    @property
+    def time_text(self):
+        return time.strftime("%H:%M:%S", time.localtime(self.timestamp))
+
+    @property
+    def severity_name(self):
+        return SEVERITIES[self.severity]
+
+    def __str__(self):
+        return f"{self.time_text} - {self.event_type}: {self.message}"
+
+
+class EventStore:
+    """Append-only, column-oriented log of every event in the session
+
+    Each event costs a double, a byte and two ints: timestamps, type ids,
+    severities and message ids live in typed arrays, and the type and
+    message strings share one intern table so repeated alerts share one
+    string. Type ids are full-width because window titles and durations
+    make most messages distinct, pushing later event types past any
+    small id range.
+    Widgets are only ever a view over this store.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.timestamps = array("d")
+        self.type_ids = array("I")
+        self.severities = array("B")
+        self.message_ids = array("I")
+        self._strings = []
+        self._string_ids = {}
+        self.alert_count = 0
+        self._observers = []
+
+    def subscribe(self, observer):
+        """Call observer(index, timestamp, event_type, severity, message) on every append
+
+        Observers run under the store lock so they see events in index order;
+        they must be cheap and non-blocking (e.g. push onto a queue).
+        """
+        self._observers.append(observer)
+
+    def intern(self, text):
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(text)
+            self._string_ids[text] = string_id
+        return string_id
+
+    def append(self, event_type, message, timestamp=None, severity=None):
+        """Record an event from any thread and return its index"""
+        if timestamp is None:
+            timestamp = time.time()
+        if severity is None:
+            severity = classify(event_type, message)
+        with self._lock:
+            self.timestamps.append(timestamp)
+            self.type_ids.append(self.intern(event_type))
+            self.severities.append(severity)
+            self.message_ids.append(self.intern(message))
+            if is_alert(event_type, message):
+                self.alert_count += 1
+            index = len(self.timestamps) - 1
+            for observer in self._observers:
+                observer(index, timestamp, event_type, severity, message)
+            return index
+
+    def __len__(self):
+        # message_ids is the last column append() extends, so every row below
+        # this length is complete even while another thread is appending
+        return len(self.message_ids)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        return Event(index, self.timestamps[index], self._strings[self.type_ids[index]],
+                     self.severities[index], self._strings[self.message_ids[index]])
+
+    def records(self, start=0, stop=None):
+        """Iterate events in [start, stop) without copying the columns"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for index in range(max(start, 0), stop):
+            yield self[index]
+
+    def tail(self, count):
+        return list(self.records(len(self) - count))
+
+    def lines(self, start=0, stop=None):
+        return [str(event) for event in self.records(start, stop)]
+
+    def string(self, string_id):
+        return self._strings[string_id]
+
+    def string_id(self, text):
+        """Id of an already interned string, or None if it was never logged"""
+        return self._string_ids.get(text)
+
+    def columns(self, start=0):
+        """Copies of (timestamps, type_ids, severities, message_ids) from `start` on
+
+        Taken under the lock, so all four always have the same length even
+        while other threads append.
+        """
+        with self._lock:
+            return (self.timestamps[start:], self.type_ids[start:],
+                    self.severities[start:], self.message_ids[start:])
+
+    def strings(self, start=0):
+        """Interned strings with ids from `start` on (string ids never change)"""
+        with self._lock:
+            return self._strings[start:]
+
+    def memory_bytes(self):
+        """Approximate size of the columns, excluding the interned strings"""
+        return sum(col.itemsize * len(col) for col in
+                   (self.timestamps, self.type_ids, self.severities, self.message_ids))
+
+
+class LogQueue:
+    """Thread-safe hand-off of new event indices from producers to the UI tick
+
+    Producers (monitor stages, the key listener) only append; the Tk thread
+    drains a bounded batch per tick. deque appends and pops are atomic, so no
+    lock is needed. `depth` is the backlog left after the last drain and
+    `peak_depth` the worst it has been, which shows when producers outrun
+    the UI.
+    """
+
+    def __init__(self, batch_limit=500):
+        self.batch_limit = batch_limit
+        self._items = deque()
+        self.depth = 0
+        self.peak_depth = 0
+        self.last_delay = 0.0
+
+    def push(self, index):
+        self._items.append((index, time.perf_counter()))
+
+    def drain(self):
+        """Pop up to batch_limit (index, enqueued_at) pairs, oldest first"""
+        batch = []
+        items = self._items
+        while items and len(batch) < self.batch_limit:
+            batch.append(items.popleft())
+        if batch:
+            self.last_delay = time.perf_counter() - batch[0][1]
+        self.depth = len(items)
+        self.peak_depth = max(self.peak_depth, self.depth + len(batch))
+        return batch
@@ -0,0 +1,207 @@
+import os
+import queue
+import re
+import time
+from collections import deque
+from threading import Thread, Condition, Lock
+
+import cv2
+import numpy as np
+
+
+class Incident:
+    __slots__ = ("label", "triggered_at", "start", "end")
+
+    def __init__(self, label, triggered_at, start, end):
+        self.label = label
+        self.triggered_at = triggered_at
+        self.start = start
+        self.end = end
+
+
+class EvidenceRecorder:
+    """Keeps the last few seconds of video in memory and saves clips around alerts
+
+    add() only hands the newest frame to a compressor thread, so the capture
+    loop never waits on encoding or disk. The compressor samples at most
+    `fps` frames a second, scales them to `size` and keeps them JPEG-encoded
+    in a ring that is trimmed both by age (enough for `pre_seconds` +
+    `post_seconds`) and by a hard `max_bytes` cap, so memory stays flat
+    however long the exam runs. trigger() marks an incident; once its
+    post-event window has been captured, the JPEGs covering
+    [trigger - pre_seconds, trigger + post_seconds] go to a writer thread that
+    saves them as an MJPG .avi under `directory`. Incidents whose windows
+    overlap are merged into one clip.
+    """
+
+    def __init__(self, directory, pre_seconds=5.0, post_seconds=5.0, fps=10, size=(800, 600),
+                 quality=70, max_bytes=48 * 1024 * 1024, max_pending=8, on_saved=None):
+        self.directory = directory
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.period = 1.0 / fps
+        self.size = size
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self.on_saved = on_saved
+
+        self._handoff = Condition()
+        self._latest = None
+        self._lock = Lock()
+        self.ring = deque()
+        self.ring_bytes = 0
+        self.incidents = deque()
+        self._clips = queue.Queue(maxsize=max_pending)
+        self.running = False
+        self._compressor = None
+        self._writer = None
+
+        self.frames_offered = 0
+        self.frames_encoded = 0
+        self.frames_evicted_by_cap = 0
+        self.peak_bytes = 0
+        self.encode_time = 0.0
+        self.clips_written = 0
+        self.clips_dropped = 0
+        self.write_errors = 0
+
+    def start(self):
+        self.running = True
+        self._compressor = Thread(target=self._compress_loop, name="evidence-compressor", daemon=True)
+        self._writer = Thread(target=self._write_loop, name="evidence-writer", daemon=True)
+        self._compressor.start()
+        self._writer.start()
+        return self
+
+    def add(self, frame, timestamp=None):
+        """Offer a captured frame (any thread); O(1), never blocks on encoding"""
+        with self._handoff:
+            self._latest = (timestamp if timestamp is not None else time.time(), frame)
+            self.frames_offered += 1
+            self._handoff.notify()
+
+    def trigger(self, label, timestamp=None):
+        """Save a clip around `timestamp` (default now) once the post-event footage is in"""
+        now = timestamp if timestamp is not None else time.time()
+        with self._lock:
+            last = self.incidents[-1] if self.incidents else None
+            if last is not None and now - self.pre_seconds <= last.end:
+                last.end = max(last.end, now + self.post_seconds)
+            else:
+                self.incidents.append(Incident(label, now, now - self.pre_seconds, now + self.post_seconds))
+
+    def _compress_loop(self):
+        params = [int(cv2.IMWRITE_JPEG_QUALITY), self.quality]
+        next_due = 0.0
+        while True:
+            with self._handoff:
+                while self._latest is None and self.running:
+                    self._handoff.wait(0.5)
+                if not self.running:
+                    break
+                timestamp, frame = self._latest
+                self._latest = None
+            if timestamp < next_due:
+                continue
+            next_due = timestamp + self.period
+
+            start = time.perf_counter()
+            if (frame.shape[1], frame.shape[0]) != self.size:
+                frame = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+            ok, encoded = cv2.imencode(".jpg", frame, params)
+            self.encode_time += time.perf_counter() - start
+            if not ok:
+                continue
+            self._store(timestamp, encoded.tobytes())
+            self._release_due(timestamp)
+        self._release_due(float("inf"))
+        self._clips.put(None)
+
+    def _store(self, timestamp, data):
+        with self._lock:
+            self.ring.append((timestamp, data))
+            self.ring_bytes += len(data)
+            self.frames_encoded += 1
+            # Frames a pending incident still needs are kept unless the byte cap forces them out
+            oldest_needed = self.incidents[0].start if self.incidents else \
+                timestamp - self.pre_seconds - self.period
+            while self.ring and self.ring[0][0] < oldest_needed:
+                self.ring_bytes -= len(self.ring.popleft()[1])
+            while self.ring_bytes > self.max_bytes and len(self.ring) > 1:
+                self.ring_bytes -= len(self.ring.popleft()[1])
+                self.frames_evicted_by_cap += 1
+            self.peak_bytes = max(self.peak_bytes, self.ring_bytes)
+
+    def _release_due(self, now):
+        """Hand incidents whose post-event window has passed to the writer"""
+        while True:
+            with self._lock:
+                if not self.incidents or self.incidents[0].end > now:
+                    return
+                incident = self.incidents.popleft()
+                frames = [(t, data) for t, data in self.ring if incident.start <= t <= incident.end]
+            if not frames:
+                continue
+            try:
+                self._clips.put_nowait((incident, frames))
+            except queue.Full:
+                self.clips_dropped += 1
+
+    def clip_path(self, incident):
+        label = re.sub(r"[^A-Za-z0-9]+", "_", incident.label).strip("_").lower() or "incident"
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(incident.triggered_at))
+        return os.path.join(self.directory, f"{stamp}_{label}.avi")
+
+    def _write_loop(self):
+        while True:
+            item = self._clips.get()
+            if item is None:
+                return
+            incident, frames = item
+            try:
+                path = self.write_clip(incident, frames)
+                self.clips_written += 1
+                if self.on_saved:
+                    self.on_saved(path, incident, len(frames))
+            except Exception as e:
+                self.write_errors += 1
+                print(f"Evidence clip error: {str(e)}")
+
+    def write_clip(self, incident, frames):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.clip_path(incident)
+        span = frames[-1][0] - frames[0][0]
+        fps = (len(frames) - 1) / span if span > 0 else 1.0 / self.period
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, self.size)
+        if not writer.isOpened():
+            raise OSError(f"Could not open {path} for writing")
+        try:
+            for _, data in frames:
+                writer.write(cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR))
+        finally:
+            writer.release()
+        return path
+
+    def close(self, timeout=10):
+        """Stop capturing, save clips for incidents still open and wait for the writer"""
+        with self._handoff:
+            self.running = False
+            self._handoff.notify()
+        if self._compressor is not None:
+            self._compressor.join(timeout)
+        if self._writer is not None:
+            self._writer.join(timeout)
+
+    def stats(self):
+        return {
+            "frames_buffered": len(self.ring),
+            "buffer_bytes": self.ring_bytes,
+            "peak_buffer_bytes": self.peak_bytes,
+            "frames_offered": self.frames_offered,
+            "frames_encoded": self.frames_encoded,
+            "frames_evicted_by_cap": self.frames_evicted_by_cap,
+            "avg_encode_ms": self.encode_time / self.frames_encoded * 1000 if self.frames_encoded else 0.0,
+            "clips_written": self.clips_written,
+            "clips_dropped": self.clips_dropped,
+            "write_errors": self.write_errors,
+        }
@@ -0,0 +1,256 @@
+import sys
+import time
+from collections import deque
+from threading import Thread, Event, Lock
+
+from metrics import registry
+
+POLL_SECONDS = registry.histogram("gtcd_window_poll_seconds", "Cost of one active-window title poll")
+SWITCH_LATENCY = registry.histogram("gtcd_window_switch_latency_seconds",
+                                    "Delay between a window switch and its detection")
+
+
+class FocusBackend:
+    """Source of foreground-window changes
+
+    start(on_change) must call on_change(title, occurred_at) from its own
+    thread whenever the foreground window (or its title) changes, where
+    occurred_at is the best estimate of when the switch actually happened.
+    """
+
+    name = "none"
+
+    def current_title(self):
+        return ""
+
+    def start(self, on_change):
+        pass
+
+    def stop(self):
+        pass
+
+
+class WinEventBackend(FocusBackend):
+    """Windows change notifications through SetWinEventHook
+
+    Listens for EVENT_SYSTEM_FOREGROUND (another window came to the front)
+    and EVENT_OBJECT_NAMECHANGE on the foreground window (e.g. switching
+    browser tabs). Each event carries the tick count at which it happened,
+    so even a switch that is undone within milliseconds is timestamped.
+    """
+
+    name = "winevent"
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    OBJID_WINDOW = 0
+    WM_QUIT = 0x0012
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        self.ctypes = ctypes
+        self.wintypes = wintypes
+        self.user32 = ctypes.windll.user32
+        self.kernel32 = ctypes.windll.kernel32
+        self._proc_type = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND, wintypes.LONG,
+            wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+        self._thread = None
+        self._thread_id = None
+        self._on_change = None
+
+    def _title(self, hwnd):
+        length = self.user32.GetWindowTextLengthW(hwnd)
+        buffer = self.ctypes.create_unicode_buffer(length + 1)
+        self.user32.GetWindowTextW(hwnd, buffer, length + 1)
+        return buffer.value
+
+    def current_title(self):
+        return self._title(self.user32.GetForegroundWindow())
+
+    def _callback(self, hook, event, hwnd, id_object, id_child, thread, event_ms):
+        if event == self.EVENT_OBJECT_NAMECHANGE and (
+                id_object != self.OBJID_WINDOW or hwnd != self.user32.GetForegroundWindow()):
+            return
+        # GetTickCount and dwmsEventTime share a clock, which gives the delivery delay
+        delay = ((self.kernel32.GetTickCount() - event_ms) & 0xFFFFFFFF) / 1000.0
+        self._on_change(self._title(hwnd), time.time() - delay)
+
+    def _run(self):
+        self._thread_id = self.kernel32.GetCurrentThreadId()
+        proc = self._proc_type(self._callback)
+        flags = self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS
+        hooks = [
+            self.user32.SetWinEventHook(self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND,
+                                        0, proc, 0, 0, flags),
+            self.user32.SetWinEventHook(self.EVENT_OBJECT_NAMECHANGE, self.EVENT_OBJECT_NAMECHANGE,
+                                        0, proc, 0, 0, flags),
+        ]
+        msg = self.wintypes.MSG()
+        while self.user32.GetMessageW(self.ctypes.byref(msg), 0, 0, 0) > 0:
+            self.user32.TranslateMessage(self.ctypes.byref(msg))
+            self.user32.DispatchMessageW(self.ctypes.byref(msg))
+        for hook in hooks:
+            if hook:
+                self.user32.UnhookWinEvent(hook)
+
+    def start(self, on_change):
+        self._on_change = on_change
+        self._thread = Thread(target=self._run, name="focus-winevent", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread_id:
+            self.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+
+
+class PollingBackend(FocusBackend):
+    """Fallback that polls the active window title on its own thread
+
+    Used where no change notifications are available. Switches shorter than
+    `interval` can still be missed, and each transition is timestamped
+    halfway between the poll that saw it and the previous one.
+    """
+
+    name = "polling"
+
+    def __init__(self, get_title=None, interval=0.1):
+        if get_title is None:
+            import pygetwindow as gw
+
+            def get_title():
+                window = gw.getActiveWindow()
+                return window.title if window else ""
+        self.get_title = get_title
+        self.interval = interval
+        self._stop = Event()
+        self._thread = None
+
+    def current_title(self):
+        return self.get_title()
+
+    def _run(self, on_change):
+        last = self.get_title()
+        previous_poll = time.time()
+        while not self._stop.wait(self.interval):
+            start = time.perf_counter()
+            try:
+                title = self.get_title()
+            except Exception:
+                continue
+            finally:
+                POLL_SECONDS.observe(time.perf_counter() - start)
+            now = time.time()
+            if title != last:
+                on_change(title, (previous_poll + now) / 2)
+                last = title
+            previous_poll = now
+
+    def start(self, on_change):
+        self._thread = Thread(target=self._run, args=(on_change,), name="focus-polling", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+class FakeBackend(FocusBackend):
+    """Scripted backend for headless tests: call switch() to simulate a change"""
+
+    name = "fake"
+
+    def __init__(self, title="Exam"):
+        self.title = title
+        self._on_change = None
+
+    def current_title(self):
+        return self.title
+
+    def start(self, on_change):
+        self._on_change = on_change
+
+    def switch(self, title, occurred_at=None):
+        self.title = title
+        if self._on_change:
+            self._on_change(title, occurred_at if occurred_at is not None else time.time())
+
+
+def default_backend(poll_interval=0.1):
+    """Change notifications on Windows, title polling elsewhere"""
+    if sys.platform == "win32":
+        try:
+            return WinEventBackend()
+        except Exception as e:
+            print(f"Window change notifications unavailable, polling instead: {str(e)}")
+    try:
+        return PollingBackend(interval=poll_interval)
+    except Exception as e:
+        print(f"Window monitoring unavailable: {str(e)}")
+        return FocusBackend()
+
+
+class Transition:
+    __slots__ = ("previous", "title", "occurred_at", "detected_at")
+
+    def __init__(self, previous, title, occurred_at, detected_at):
+        self.previous = previous
+        self.title = title
+        self.occurred_at = occurred_at
+        self.detected_at = detected_at
+
+    @property
+    def latency(self):
+        return max(0.0, self.detected_at - self.occurred_at)
+
+
+class WindowFocusMonitor:
+    """Tracks foreground-window transitions reported by a backend
+
+    Every transition is timestamped and kept (up to `history`) together with
+    its detection latency, then handed to `on_transition` on the backend's
+    thread, so window tracking never shares a loop with frame analysis.
+    """
+
+    def __init__(self, on_transition, backend=None, history=1000):
+        self.backend = backend if backend is not None else default_backend()
+        self.on_transition = on_transition
+        self.transitions = deque(maxlen=history)
+        self.current = ""
+        self.count = 0
+        self._latency_total = 0.0
+        self.max_latency = 0.0
+        self._lock = Lock()
+
+    def start(self):
+        self.current = self.backend.current_title()
+        self.backend.start(self._on_change)
+        return self
+
+    def stop(self):
+        self.backend.stop()
+
+    def _on_change(self, title, occurred_at):
+        detected_at = time.time()
+        with self._lock:
+            if title == self.current:
+                return
+            transition = Transition(self.current, title, occurred_at, detected_at)
+            self.current = title
+            self.transitions.append(transition)
+            self.count += 1
+            self._latency_total += transition.latency
+            self.max_latency = max(self.max_latency, transition.latency)
+        SWITCH_LATENCY.observe(transition.latency)
+        self.on_transition(transition)
+
+    def stats(self):
+        return {
+            "backend": self.backend.name,
+            "transitions": self.count,
+            "mean_latency_ms": self._latency_total / self.count * 1000 if self.count else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+        }
@@ -0,0 +1,194 @@
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+from threading import Thread, Event
+
+
+class SessionJournal:
+    """Append-only on-disk log of session events, written off the hot path
+
+    record() only appends to an in-memory deque, so producers (the capture
+    stages, the key listener, the Tk thread) never wait on disk. A writer
+    thread wakes every `flush_interval` seconds, or early once `batch_size`
+    records are pending, writes the whole batch as JSON lines and fsyncs
+    once per batch. Segments rotate at `segment_bytes`. A `CLOSED` marker
+    is written on clean shutdown; a session directory without one was
+    interrupted and can be replayed into a fresh EventStore. Each journal
+    also records the identity of its session (exam or candidate id), so a
+    crashed session is only ever resumed by the same session.
+    """
+
+    SEGMENT_PREFIX = "journal-"
+    SEGMENT_SUFFIX = ".jsonl"
+    CLOSED_MARKER = "CLOSED"
+    IDENTITY_FILE = "SESSION"
+
+    def __init__(self, directory, segment_bytes=8 * 1024 * 1024, flush_interval=0.2,
+                 batch_size=4096, fsync=True):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+
+        self._pending = deque()
+        self._wake = Event()
+        self._closed = False
+        self._file = None
+        self._size = 0
+        existing = self.segments(directory)
+        self.segment_index = self._segment_number(existing[-1]) if existing else 0
+
+        self.records_written = 0
+        self.bytes_written = 0
+        self.batches = 0
+        self.write_errors = 0
+
+        self._open_segment()
+        self._thread = Thread(target=self._run, name="journal", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def new_session(cls, root="sessions", identity="", **kwargs):
+        session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        journal = cls(os.path.join(root, session_id, "journal"), **kwargs)
+        with open(os.path.join(journal.directory, cls.IDENTITY_FILE), "w", encoding="utf-8") as f:
+            f.write(identity)
+        return journal
+
+    @classmethod
+    def identity(cls, directory):
+        """Session identity a journal was started with ("" if none was given)"""
+        try:
+            with open(os.path.join(directory, cls.IDENTITY_FILE), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return ""
+
+    @classmethod
+    def segments(cls, directory):
+        if not os.path.isdir(directory):
+            return []
+        names = [name for name in os.listdir(directory)
+                 if name.startswith(cls.SEGMENT_PREFIX) and name.endswith(cls.SEGMENT_SUFFIX)]
+        return [os.path.join(directory, name) for name in sorted(names)]
+
+    @classmethod
+    def _segment_number(cls, path):
+        name = os.path.basename(path)
+        return int(name[len(cls.SEGMENT_PREFIX):-len(cls.SEGMENT_SUFFIX)])
+
+    @classmethod
+    def find_unfinished(cls, root="sessions", identity="", max_age=15 * 60, now=None):
+        """Journal directory of the newest resumable session that was not closed cleanly
+
+        Only a journal started with the same `identity` and written to within
+        the last `max_age` seconds counts, so a crash in one exam is never
+        carried into the next one on the same machine; older interrupted
+        journals stay on disk untouched.
+        """
+        if not os.path.isdir(root):
+            return None
+        now = time.time() if now is None else now
+        for session_id in sorted(os.listdir(root), reverse=True):
+            directory = os.path.join(root, session_id, "journal")
+            segments = cls.segments(directory)
+            if not segments or os.path.exists(os.path.join(directory, cls.CLOSED_MARKER)):
+                continue
+            if cls.identity(directory) != identity:
+                continue
+            if now - max(os.path.getmtime(path) for path in segments) > max_age:
+                continue
+            return directory
+        return None
+
+    @classmethod
+    def replay(cls, directory):
+        """Yield (timestamp, event_type, severity, message) in write order
+
+        A torn line at the end of a segment (the process died mid-write) ends
+        that segment; everything before it is still recovered.
+        """
+        for path in cls.segments(directory):
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        timestamp, event_type, severity, message = json.loads(line)
+                    except ValueError:
+                        break
+                    yield timestamp, event_type, severity, message
+
+    @classmethod
+    def recover(cls, directory, store):
+        """Rebuild `store` (and its alert count) from a journal; returns events restored"""
+        restored = 0
+        for timestamp, event_type, severity, message in cls.replay(directory):
+            store.append(event_type, message, timestamp=timestamp, severity=severity)
+            restored += 1
+        return restored
+
+    def record(self, index, timestamp, event_type, severity, message):
+        """EventStore observer: queue one event for the writer thread"""
+        self._pending.append((timestamp, event_type, severity, message))
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    @property
+    def backlog(self):
+        return len(self._pending)
+
+    def _open_segment(self):
+        self.segment_index += 1
+        path = os.path.join(self.directory,
+                            f"{self.SEGMENT_PREFIX}{self.segment_index:06d}{self.SEGMENT_SUFFIX}")
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush()
+        self._flush()
+
+    def _flush(self):
+        pending = self._pending
+        batch = []
+        while pending:
+            batch.append(pending.popleft())
+        if not batch:
+            return
+        data = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+                       for record in batch).encode("utf-8")
+        try:
+            self._file.write(data)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        except OSError as e:
+            self.write_errors += 1
+            print(f"Journal write failed: {str(e)}")
+            return
+        self._size += len(data)
+        self.records_written += len(batch)
+        self.bytes_written += len(data)
+        self.batches += 1
+        if self._size >= self.segment_bytes:
+            self._file.close()
+            self._open_segment()
+
+    def close(self):
+        """Flush everything, stop the writer and mark the session as cleanly closed"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self._file.close()
+        with open(os.path.join(self.directory, self.CLOSED_MARKER), "w") as f:
+            f.write(f"{time.time()}\n")
@@ -0,0 +1,210 @@
+"""Keyboard analytics: chords, sequences and lone modifier taps
+
+The pynput listener thread only appends (kind, key, timestamp) tuples to a
+deque, which is safe without locks for one producer and one consumer. A
+consumer thread normalises key names and runs KeyAnalyzer, which turns the
+raw stream into a few meaningful, debounced alerts. KeyAnalyzer.process()
+can be fed synthetic streams directly, without a keyboard or a thread.
+"""
+import time
+from collections import deque
+from threading import Thread, Event
+
+MODIFIERS = {
+    "alt": "alt", "alt_l": "alt", "alt_r": "alt", "alt_gr": "alt",
+    "ctrl": "ctrl", "ctrl_l": "ctrl", "ctrl_r": "ctrl",
+    "shift": "shift", "shift_l": "shift", "shift_r": "shift",
+    "cmd": "win", "cmd_l": "win", "cmd_r": "win",
+}
+
+# Chord (modifiers + key) -> (event type, message)
+CHORDS = {
+    frozenset(("alt", "tab")): ("AI ALERT", "Window switch shortcut (Alt+Tab)"),
+    frozenset(("win", "tab")): ("AI ALERT", "Task view shortcut (Win+Tab)"),
+    frozenset(("ctrl", "c")): ("WARNING", "Copy shortcut (Ctrl+C)"),
+    frozenset(("ctrl", "v")): ("WARNING", "Paste shortcut (Ctrl+V)"),
+    frozenset(("win", "shift", "s")): ("AI ALERT", "Screenshot shortcut (Win+Shift+S)"),
+    frozenset(("print_screen",)): ("AI ALERT", "Screenshot key (Print Screen)"),
+}
+
+# Chords that follow each other within `within` seconds -> (event type, message)
+SEQUENCES = [
+    (("ctrl+c", "ctrl+v"), 10.0, ("AI ALERT", "Copied and pasted text (Ctrl+C then Ctrl+V)")),
+    (("win+shift+s", "ctrl+v"), 30.0, ("AI ALERT", "Pasted a screenshot (Win+Shift+S then Ctrl+V)")),
+]
+
+# A modifier pressed and released on its own, as the original Alt/Win alert intended
+TAP_ALERT = ("AI ALERT", "LLM access attempt detected!")
+TAP_KEYS = ("alt", "win")
+
+
+def key_name(key):
+    """Normalised name for a pynput key (or a plain string from a synthetic stream)"""
+    if isinstance(key, str) and len(key) > 1:
+        name = key.lower()
+    elif getattr(key, "name", None):
+        name = key.name
+    else:
+        char = key if isinstance(key, str) else getattr(key, "char", None)
+        if char:
+            # With Ctrl held pynput reports control characters (Ctrl+C -> '\x03')
+            name = chr(ord(char) + 96) if ord(char) < 32 else char.lower()
+        else:
+            vk = getattr(key, "vk", None)
+            name = chr(vk).lower() if vk is not None and 48 <= vk <= 90 else f"vk{vk}"
+    return MODIFIERS.get(name, name)
+
+
+def chord_name(keys):
+    order = ("ctrl", "alt", "win", "shift")
+    return "+".join(sorted(keys, key=lambda k: (order.index(k) if k in order else len(order), k)))
+
+
+class KeyAnalyzer:
+    """Turns key down/up events into debounced chord, sequence and tap alerts
+
+    Auto-repeat (a key reported down again while held) is ignored. An alert
+    that fires again within `debounce` seconds is only counted; the count
+    is reported once the debounce window ends. Key-down counts are kept per
+    second for the last `history` seconds.
+    """
+
+    def __init__(self, emit, debounce=2.0, chords=None, sequences=None, tap_timeout=1.0, history=60):
+        self.emit = emit
+        self.debounce = debounce
+        self.chords = CHORDS if chords is None else chords
+        self.sequences = SEQUENCES if sequences is None else sequences
+        self.tap_timeout = tap_timeout
+        self.held = {}
+        self._tap = None
+        self.recent_chords = deque(maxlen=16)
+        self._last_emit = {}
+        self._suppressed = {}
+
+        self.per_second = deque(maxlen=history)
+        self.events = 0
+        self.alerts = 0
+        self.suppressed_total = 0
+
+    def process(self, kind, key, timestamp):
+        name = key_name(key)
+        self.events += 1
+        if kind == "up":
+            pressed_at = self.held.pop(name, None)
+            if self._tap == name and pressed_at is not None and timestamp - pressed_at <= self.tap_timeout:
+                self.alert(TAP_ALERT, timestamp)
+            if self._tap == name:
+                self._tap = None
+            return
+        if name in self.held:
+            return  # auto-repeat
+        self.held[name] = timestamp
+        self._count(timestamp)
+
+        modifiers = {k for k in self.held if k in MODIFIERS.values() and k != name}
+        # Only a modifier pressed with nothing else held can become a tap
+        self._tap = name if name in TAP_KEYS and not modifiers else None
+        combo = frozenset(modifiers | {name})
+        if combo in self.chords:
+            self.alert(self.chords[combo], timestamp)
+            self._sequence(chord_name(combo), timestamp)
+
+    def _sequence(self, chord, timestamp):
+        self.recent_chords.append((chord, timestamp))
+        for steps, within, alert in self.sequences:
+            if chord != steps[-1]:
+                continue
+            # Walk back through earlier chords looking for the steps in order
+            wanted = len(steps) - 2
+            for earlier, at in reversed(list(self.recent_chords)[:-1]):
+                if timestamp - at > within:
+                    break
+                if earlier == steps[wanted]:
+                    wanted -= 1
+                    if wanted < 0:
+                        self.alert(alert, timestamp)
+                        break
+
+    def _count(self, timestamp):
+        second = int(timestamp)
+        if self.per_second and self.per_second[-1][0] == second:
+            self.per_second[-1][1] += 1
+        else:
+            self.per_second.append([second, 1])
+
+    def alert(self, alert, timestamp):
+        last = self._last_emit.get(alert)
+        if last is not None and timestamp - last < self.debounce:
+            self._suppressed[alert] = self._suppressed.get(alert, 0) + 1
+            self.suppressed_total += 1
+            return
+        self._last_emit[alert] = timestamp
+        self.alerts += 1
+        self.emit(*alert)
+
+    def tick(self, now):
+        """Report repeats that were held back once their debounce window has passed"""
+        for alert, count in list(self._suppressed.items()):
+            if now - self._last_emit[alert] >= self.debounce:
+                del self._suppressed[alert]
+                self._last_emit[alert] = now
+                event_type, message = alert
+                self.emit(event_type, f"{message} (repeated {count}x)")
+
+    def stats(self):
+        rates = [count for _, count in self.per_second]
+        return {
+            "key_events": self.events,
+            "alerts": self.alerts,
+            "suppressed": self.suppressed_total,
+            "peak_keys_per_sec": max(rates, default=0),
+        }
+
+
+class KeyboardMonitor:
+    """Feeds listener callbacks to a KeyAnalyzer on its own consumer thread"""
+
+    def __init__(self, analyzer, poll_interval=0.05, capacity=4096):
+        self.analyzer = analyzer
+        self.poll_interval = poll_interval
+        self.queue = deque(maxlen=capacity)
+        self._stop = Event()
+        self._thread = None
+        self.processed = 0
+        self.max_lag = 0.0
+
+    # Listener-thread side: append only
+    def on_press(self, key):
+        self.queue.append(("down", key, time.time()))
+
+    def on_release(self, key):
+        self.queue.append(("up", key, time.time()))
+
+    def start(self):
+        self._thread = Thread(target=self._run, name="key-analytics", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def drain(self):
+        """Process everything queued so far (consumer thread, or tests)"""
+        while self.queue:
+            kind, key, timestamp = self.queue.popleft()
+            self.max_lag = max(self.max_lag, time.time() - timestamp)
+            try:
+                self.analyzer.process(kind, key, timestamp)
+            except Exception as e:
+                print(f"Key analytics error: {str(e)}")
+            self.processed += 1
+        self.analyzer.tick(time.time())
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            self.drain()
+
+    def stats(self):
+        stats = self.analyzer.stats()
+        stats.update({"processed": self.processed, "max_lag_ms": self.max_lag * 1000})
+        return stats
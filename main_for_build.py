@@ -1,20 +1,31 @@
+import argparse
 import cv2
-import pygetwindow as gw
 import time
 import customtkinter as ctk
-from pynput import keyboard
+import tkinter as tk
 from threading import Thread, Lock
-from PIL import Image
-import numpy as np
+import json
 import winsound
-import google.generativeai as genai
-import textwrap
 from datetime import datetime
-from fpdf import FPDF
 import os
 
+from events import EventStore, LogQueue, is_alert, SEVERITIES
+from journal import SessionJournal
+from display import FrameDisplay
+from summary import SummaryJob, IncrementalSummarizer
+from widgets import VirtualLogList
+from metrics import registry, MetricsServer
+from profiling import ProfileSession, profile_directory
+
+LOG_QUEUE_DELAY = registry.histogram("gtcd_log_queue_delay_seconds",
+                                     "Time from log_event until the UI tick applied the event")
+
+# Imports are done: the rest of startup is window, camera and first frame
+IMPORTED_AT = time.time()
+
+
 class GoogolCheatingDetectorApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, startup_probe=None):
         super().__init__()
         self.title("Googol Test Cheating Detector")
         self.geometry("1400x1100")
@@ -24,11 +35,40 @@ class GoogolCheatingDetectorApp(ctk.CTk):
         self.cheat_counter = 0
         self.running = True
         self.camera = None
-        self.log_entries = []
+        self.events = EventStore()
+        self.log_queue = LogQueue()
+        self.session_root = "sessions"
+        self.journal = self.open_journal()
+        self.log_flush_interval = 100
+        self.display_fps = 30
+        self.summary_job = None
+        self.summarizer = IncrementalSummarizer(self.events)
+        self.summary_timeout = 90
+        self.summary_poll_interval = 50
+        self.report_job = None
+        self.event_index = None
+        self.search_delay = 150
+        self.report_poll_interval = 200
+        self.camera_status = "SYSTEM ACTIVE"
+        self.pipeline_status = ""
+        self.attention = None
+        self.metrics_server = self.start_metrics_server()
+        self.metrics_overlay = None
+        self.overlay_updated = 0.0
+        self.profile = None
+        self.profile_seconds = 30
+        # Launch milestones (wall clock); with startup_probe they are printed and the app exits
+        self.startup_probe = startup_probe
+        self.startup_marks = {"imported": IMPORTED_AT}
         self.gemini_model = None
         
-        # Show API key prompt before creating the UI
-        self.show_api_key_popup()
+        if startup_probe:
+            # Launch timing needs no summaries: skip the key prompt
+            self.start_session(os.getenv("GEMINI_API_KEY", ""))
+        else:
+            # Show API key prompt before creating the UI
+            self.show_api_key_popup()
+        self.after(self.log_flush_interval, self.flush_log_queue)
         
     def show_api_key_popup(self):
         """Show popup to get Gemini API key from user"""
@@ -90,25 +130,94 @@ class GoogolCheatingDetectorApp(ctk.CTk):
             popup.after(2000, error_label.destroy)
             return
         
-        self.gemini_api_key = api_key
         popup.destroy()
-        
-        # Now create the UI and initialize
+        self.start_session(api_key)
+
+    def start_session(self, api_key):
+        """Create the UI, start monitoring and set up Gemini in the background"""
+        self.gemini_api_key = api_key
         self.create_ui()
         self.protocol("WM_DELETE_WINDOW", self.on_close)
-        
-        # Initialize Gemini API
-        if self.init_gemini():
-            # Initialize camera
-            if self.init_camera():
-                proctor = GoogolCheatingDetectorAI(self)
-                monitor_thread = Thread(target=proctor.monitor_environment)
-                monitor_thread.daemon = True
-                monitor_thread.start()
-        
+        self.start_monitoring()
+        if api_key:
+            # The Gemini client is slow to import and only needed for summaries
+            Thread(target=self.init_gemini, name="gemini-init", daemon=True).start()
+        
+    def start_metrics_server(self):
+        """Prometheus endpoint on localhost; GTCD_METRICS_PORT=0 turns it off"""
+        port = int(os.getenv("GTCD_METRICS_PORT", "9464"))
+        if not port:
+            return None
+        try:
+            return MetricsServer(registry, port=port).start()
+        except Exception as e:
+            print(f"Metrics endpoint unavailable: {str(e)}")
+            return None
+
+    def start_profiling(self, event=None, duration=None):
+        """Ctrl+Shift+F12: sample CPU stacks and allocation growth into the session directory"""
+        if self.profile and self.profile.running:
+            return
+        root = os.path.dirname(self.journal.directory) if self.journal else "."
+        directory = profile_directory(os.path.join(root, "profiles"))
+        duration = duration or self.profile_seconds
+        self.profile = ProfileSession(directory, duration=duration, on_done=self.on_profile_done).start()
+        self.log_event("INFO", f"Profiling for {duration:.0f}s")
+
+    def on_profile_done(self, profile):
+        if profile.error is None:
+            self.log_event("INFO", f"Profile saved to {profile.directory}")
+        else:
+            self.log_event("ERROR", f"Profiling failed: {str(profile.error)}")
+
+    def toggle_metrics_overlay(self, event=None):
+        """F3: show or hide per-stage timings over the video"""
+        if self.metrics_overlay is not None:
+            self.metrics_overlay.destroy()
+            self.metrics_overlay = None
+            return
+        self.metrics_overlay = tk.Label(self.video_container, justify="left", anchor="nw",
+                                        font=("Consolas", 10), bg="black", fg="#00ff00")
+        self.metrics_overlay.place(x=30, y=30)
+        self.overlay_updated = 0.0
+
+    def update_metrics_overlay(self):
+        now = time.perf_counter()
+        if self.metrics_overlay is None or now - self.overlay_updated < 1.0:
+            return
+        self.overlay_updated = now
+        display = self.display.stats()
+        lines = registry.summary_lines() + [
+            f"display: {display['paints']} paints, {display['mean_render_ms']:.1f}ms avg, "
+            f"{display['allocated_bytes_per_paint']:.0f} B/paint allocated, "
+            f"{display['skipped_unchanged']} unchanged skipped"]
+        self.metrics_overlay.configure(text="\n".join(lines))
+
+    def open_journal(self):
+        """Resume the journal of an interrupted session, or start a new one"""
+        try:
+            # Set by the exam launcher so a crashed session resumes only for the same exam and candidate
+            identity = os.getenv("GTCD_SESSION_ID", "")
+            unfinished = SessionJournal.find_unfinished(self.session_root, identity=identity)
+            restored = 0
+            if unfinished:
+                restored = SessionJournal.recover(unfinished, self.events)
+                self.cheat_counter = self.events.alert_count
+                journal = SessionJournal(unfinished)
+            else:
+                journal = SessionJournal.new_session(self.session_root, identity=identity)
+            self.events.subscribe(journal.record)
+            if restored:
+                self.log_event("INFO", f"Recovered {restored} events from an interrupted session")
+            return journal
+        except Exception as e:
+            print(f"Session journal unavailable: {str(e)}")
+            return None
+
     def init_gemini(self):
         """Initialize the Gemini API"""
         try:
+            import google.generativeai as genai
             genai.configure(api_key=self.gemini_api_key)
             self.gemini_model = genai.GenerativeModel('gemini-2.0-flash')
             self.log_event("INFO", "Gemini API initialized successfully")
@@ -141,8 +250,16 @@ class GoogolCheatingDetectorApp(ctk.CTk):
 
         self.video_container = ctk.CTkFrame(self, corner_radius=20)
         self.video_container.pack(pady=20, fill="both", expand=True, padx=25)
-        self.video_label = ctk.CTkLabel(self.video_container, text="")
+        # A plain Tk label: FrameDisplay repaints one PhotoImage in place instead of
+        # building a new CTkImage per frame
+        self.video_label = tk.Label(self.video_container, bg="gray17", borderwidth=0,
+                                    highlightthickness=0)
         self.video_label.pack(pady=25)
+        self.display = FrameDisplay(self.video_label, fps=self.display_fps)
+        self.display.start()
+        self.bind("<F3>", self.toggle_metrics_overlay)
+        self.after_idle(lambda: self.startup_marks.setdefault("window", time.time()))
+        self.bind("<Control-Shift-F12>", self.start_profiling)
 
         self.log_panel = ctk.CTkFrame(self, corner_radius=20, height=450)
         self.log_panel.pack(pady=15, fill="both", expand=True, padx=25)
@@ -156,8 +273,8 @@ class GoogolCheatingDetectorApp(ctk.CTk):
                                         text_color="#ff4444", font=("Arial", 18, "bold"))
         self.counter_label.pack(side="right", padx=25)
         
-        self.log_scroll = ctk.CTkScrollableFrame(self.log_panel, height=400)
-        self.log_scroll.pack(fill="both", expand=True, padx=15, pady=10)
+        self.log_list = VirtualLogList(self.log_panel, self.events, height=400)
+        self.log_list.pack(fill="both", expand=True, padx=15, pady=10)
         
         self.summary_button = ctk.CTkButton(control_frame, text="📝 Generate Summary",
                                           font=("Arial", 14), command=self.generate_summary)
@@ -169,64 +286,42 @@ class GoogolCheatingDetectorApp(ctk.CTk):
         self.api_key_button.pack(side="right", padx=10)
         
     def generate_summary(self):
-        """Generate a summary of the logs using Gemini API"""
+        """Generate a summary of the logs using Gemini API without blocking the UI"""
         if not self.gemini_model:
             self.log_event("ERROR", "Gemini API not available for summary generation")
             print("Gemini API not available for summary generation")
             return
+        if self.summary_job and self.summary_job.running:
+            return
             
         try:
-            log_data = []
-            for entry in self.log_entries:
-                try:
-                    timestamp = entry.winfo_children()[0].cget("text")
-                    event_type = entry.winfo_children()[1].cget("text")
-                    message = entry.winfo_children()[2].cget("text")
-                    log_data.append(f"{timestamp} - {event_type}: {message}")
-                except:
-                    continue
-                    
-            if not log_data:
+            if not len(self.events):
                 self.log_event("INFO", "No logs available to generate summary")
                 print("No logs available to generate summary")
                 return
+
+            if not self.summarizer.pending and self.summarizer.summary:
+                # Nothing new since the last report: show it again instead of paying for a request
+                self.summary_job = SummaryJob.completed(self.summarizer.summary)
+                self.show_summary_popup(self.summary_job)
+                return
                 
-            prompt = textwrap.dedent(f"""
-            Analyze these cheating detection logs from an exam proctoring system and create a comprehensive summary report.
-            Focus on identifying patterns, suspicious activities, and overall test integrity.
-            Provide the summary in this format:
-            
-            **Exam Integrity Report**
-            - Date: {datetime.now().strftime("%Y-%m-%d")}
-            - Total Alerts: {self.cheat_counter}
-            
-            **Key Findings**
-            [Bullet points of important findings]
-            
-            **Suspicious Activity Timeline**
-            [List most important events in chronological order]
-            
-            **Final Assessment**
-            [Overall assessment of test integrity]
-            
-            Logs to analyze:
-            {"\n".join(log_data[-100:])}
-            """)
+            prompt, watermark = self.summarizer.build_prompt(
+                datetime.now().strftime("%Y-%m-%d"), self.cheat_counter,
+                self.attention.describe() if self.attention else None)
             
             self.summary_button.configure(state="disabled", text="Generating...")
-            self.update()
-            
-            response = self.gemini_model.generate_content(prompt)
-            self.show_summary_popup(response.text)
+            self.summary_job = SummaryJob(self.gemini_model, prompt, timeout=self.summary_timeout).start()
+            self.summary_job.watermark = watermark
+            self.show_summary_popup(self.summary_job)
             
         except Exception as e:
             self.log_event("ERROR", f"Summary generation failed: {str(e)}")
             print(f"Summary generation failed: {str(e)}")
-        finally:
             self.summary_button.configure(state="normal", text="📝 Generate Summary")
 
-    def show_summary_popup(self, summary_text):
-        """Display the generated summary in a popup window"""
+    def show_summary_popup(self, job):
+        """Display the summary popup and stream the job's text into it as it arrives"""
         popup = ctk.CTkToplevel(self)
         popup.title("Exam Integrity Summary Report")
         popup.geometry("1200x800")
@@ -236,10 +331,60 @@ class GoogolCheatingDetectorApp(ctk.CTk):
         ctk.CTkLabel(header, text="Exam Integrity Summary", 
                     font=("Arial Black", 24)).pack(side="left")
         ctk.CTkButton(header, text="Close", command=popup.destroy).pack(side="right")
+        cancel_button = ctk.CTkButton(header, text="Cancel", fg_color="#ff4444",
+                                      hover_color="#cc3333", command=job.cancel)
+        cancel_button.pack(side="right", padx=10)
+        status = ctk.CTkLabel(header, text="Generating...", font=("Consolas", 14),
+                              text_color="#aaaaaa")
+        status.pack(side="right", padx=10)
         
         content = ctk.CTkScrollableFrame(popup)
         content.pack(fill="both", expand=True, padx=20, pady=10)
+        stream_box = ctk.CTkTextbox(content, font=("Arial", 14), wrap="word", height=650)
+        stream_box.pack(fill="both", expand=True)
         
+        footer = ctk.CTkFrame(popup)
+        footer.pack(fill="x", padx=20, pady=10)
+        export_button = ctk.CTkButton(footer, text="Export as PDF", state="disabled",
+                                      command=lambda: self.export_summary(job.text))
+        export_button.pack(side="right")
+        
+        popup.attributes('-topmost', True)
+        popup.after(100, lambda: popup.attributes('-topmost', False))
+        
+        def poll():
+            if not popup.winfo_exists():
+                job.cancel()
+                self.summary_button.configure(state="normal", text="📝 Generate Summary")
+                return
+            new_text = job.poll()
+            if new_text:
+                stream_box.insert("end", new_text)
+                stream_box.see("end")
+            if job.running:
+                self.after(self.summary_poll_interval, poll)
+                return
+            
+            self.summary_button.configure(state="normal", text="📝 Generate Summary")
+            cancel_button.configure(state="disabled")
+            if job.state == SummaryJob.DONE:
+                if job.watermark is not None:
+                    self.summarizer.commit(job.text, job.watermark)
+                status.configure(text="")
+                stream_box.destroy()
+                self.render_summary(content, job.text)
+                export_button.configure(state="normal")
+            elif job.state == SummaryJob.CANCELLED:
+                status.configure(text="Cancelled", text_color="#ffaa00")
+            else:
+                status.configure(text=f"Failed ({job.state})", text_color="#ff4444")
+                self.log_event("ERROR", f"Summary generation failed: {str(job.error)}")
+                print(f"Summary generation failed: {str(job.error)}")
+        
+        self.after(self.summary_poll_interval, poll)
+
+    def render_summary(self, content, summary_text):
+        """Lay out a finished summary as headings, bullets and paragraphs"""
         formatted_text = summary_text.replace("•", "• ")
         text_parts = formatted_text.split("\n")
         
@@ -263,51 +408,59 @@ class GoogolCheatingDetectorApp(ctk.CTk):
                             font=("Arial", 14), 
                             wraplength=1000, 
                             justify="left").pack(anchor="w", pady=2)
-        
-        footer = ctk.CTkFrame(popup)
-        footer.pack(fill="x", padx=20, pady=10)
-        ctk.CTkButton(footer, text="Export as PDF", 
-                     command=lambda: self.export_summary(summary_text)).pack(side="right")
-        
-        popup.attributes('-topmost', True)
-        popup.after(100, lambda: popup.attributes('-topmost', False))
 
     def export_summary(self, text):
-        """Export the summary as a PDF file"""
-        try:            
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_font("Arial", size=12)
-            
-            pdf.set_font("Arial", 'B', 16)
-            pdf.cell(200, 10, txt="Exam Integrity Report", ln=1, align='C')
-            pdf.set_font("Arial", size=12)
-            pdf.cell(200, 10, txt=f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=1)
-            pdf.cell(200, 10, txt=f"Total Alerts: {self.cheat_counter}", ln=1)
-            pdf.ln(10)
-            
-            for line in text.split('\n'):
-                if line.strip() == "":
-                    continue
-                if line.startswith("**") and line.endswith("**"):
-                    pdf.set_font("Arial", 'B', 14)
-                    pdf.cell(200, 10, txt=line[2:-2], ln=1)
-                    pdf.set_font("Arial", size=12)
-                else:
-                    pdf.multi_cell(0, 10, txt=line)
-            
-            if not os.path.exists("reports"):
-                os.makedirs("reports")
-                
+        """Render the report PDF on a worker thread and show its progress"""
+        if self.report_job and self.report_job.running:
+            return
+        try:
+            # Imported on first export: the report module pulls in NumPy
+            from report import ReportJob
             filename = f"reports/exam_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            pdf.output(filename)
-            
-            self.show_notification("✅ PDF Saved Successfully", f"Location: {filename}")
-            self.log_event("INFO", f"Report saved as {filename}")
+            details = [f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                       f"Total Alerts: {self.cheat_counter}"]
+            if self.attention:
+                details.append(f"Attention: {self.attention.describe()}")
+            self.report_job = ReportJob(filename, self.events, summary=text, details=details).start()
+            self.show_report_progress(self.report_job)
         except Exception as e:
             self.log_event("ERROR", f"Failed to export PDF: {str(e)}")
             self.show_notification("❌ PDF Export Failed", f"Error: {str(e)}", is_error=True)
 
+    def show_report_progress(self, job):
+        """Small progress window for a report job; closing it leaves the job running"""
+        popup = ctk.CTkToplevel(self)
+        popup.title("Exporting Report")
+        popup.geometry("420x150")
+        popup.attributes('-topmost', True)
+        label = ctk.CTkLabel(popup, text="Preparing report...", font=("Arial", 14))
+        label.pack(pady=(15, 5))
+        bar = ctk.CTkProgressBar(popup, width=360)
+        bar.set(0)
+        bar.pack(pady=5)
+        ctk.CTkButton(popup, text="Cancel", fg_color="#ff4444", hover_color="#cc3333",
+                      command=job.cancel).pack(pady=10)
+
+        def poll():
+            if job.running:
+                if popup.winfo_exists():
+                    bar.set(job.progress)
+                    label.configure(text=f"Writing page {job.pages + 1} ({job.progress:.0%})")
+                self.after(self.report_poll_interval, poll)
+                return
+            if popup.winfo_exists():
+                popup.destroy()
+            if job.state == job.DONE:
+                self.show_notification("✅ PDF Saved Successfully", f"Location: {job.path}")
+                self.log_event("INFO", f"Report saved as {job.path} ({job.pages} pages)")
+            elif job.state == job.CANCELLED:
+                self.log_event("INFO", "Report export cancelled")
+            else:
+                self.log_event("ERROR", f"Failed to export PDF: {str(job.error)}")
+                self.show_notification("❌ PDF Export Failed", f"Error: {str(job.error)}", is_error=True)
+
+        self.after(self.report_poll_interval, poll)
+
     def show_notification(self, title, message, is_error=False):
         """Show a temporary notification popup"""
         popup = ctk.CTkToplevel(self)
@@ -358,174 +511,215 @@ class GoogolCheatingDetectorApp(ctk.CTk):
                     font=("Arial Black", 24)).pack(side="left")
         ctk.CTkButton(popup_header, text="Close", command=popup.destroy).pack(side="right")
         
-        log_container = ctk.CTkScrollableFrame(popup)
-        log_container.pack(fill="both", expand=True, padx=20, pady=10)
-        
-        for entry in self.log_entries:
+        # Imported on first use: the index is NumPy-based
+        from search import EventIndex, EventView, clock_time
+        if self.event_index is None:
+            self.event_index = EventIndex(self.events)
+        index = self.event_index
+        index.update()
+
+        filters = ctk.CTkFrame(popup)
+        filters.pack(fill="x", padx=20)
+        search_entry = ctk.CTkEntry(filters, placeholder_text="Search messages and types", width=380)
+        search_entry.pack(side="left", padx=10, pady=8)
+        all_types, all_levels = "All types", "All severities"
+        type_menu = ctk.CTkOptionMenu(filters, values=[all_types] + index.event_types(),
+                                      command=lambda _: schedule())
+        type_menu.pack(side="left", padx=5)
+        level_names = {f"{name} and above": level for level, name in enumerate(SEVERITIES) if level}
+        level_menu = ctk.CTkOptionMenu(filters, values=[all_levels] + list(level_names),
+                                       command=lambda _: schedule())
+        level_menu.pack(side="left", padx=5)
+        since_entry = ctk.CTkEntry(filters, placeholder_text="From HH:MM", width=110)
+        since_entry.pack(side="left", padx=5)
+        until_entry = ctk.CTkEntry(filters, placeholder_text="To HH:MM", width=110)
+        until_entry.pack(side="left", padx=5)
+        count_label = ctk.CTkLabel(filters, text=f"{len(self.events)} events", font=("Consolas", 14),
+                                   text_color="#aaaaaa")
+        count_label.pack(side="right", padx=10)
+
+        log_list = VirtualLogList(popup, self.events, row_height=40, font_size=14,
+                                  message_width=1000, follow=False)
+        log_list.pack(fill="both", expand=True, padx=20, pady=10)
+
+        pending = [None]
+
+        def schedule(event=None):
+            # Typing restarts the timer, so a query runs once the user pauses
+            if pending[0] is not None:
+                popup.after_cancel(pending[0])
+            pending[0] = popup.after(self.search_delay, apply)
+
+        def apply():
+            pending[0] = None
+            text = search_entry.get()
+            event_type, level = type_menu.get(), level_menu.get()
             try:
-                timestamp = entry.winfo_children()[0].cget("text")
-                event_type = entry.winfo_children()[1].cget("text")
-                message = entry.winfo_children()[2].cget("text")
-                color = entry.cget("fg_color")
-                entry_copy = ctk.CTkFrame(log_container, fg_color=color, corner_radius=8, height=50)
-                ctk.CTkLabel(entry_copy, text=timestamp, font=("Consolas", 14), width=150).pack(side="left", padx=10)
-                ctk.CTkLabel(entry_copy, text=event_type, font=("Arial", 14, "bold"), width=220).pack(side="left", padx=10)
-                ctk.CTkLabel(entry_copy, text=message, font=("Arial", 14), wraplength=1200).pack(side="left", padx=10, fill="x", expand=True)
-                entry_copy.pack(fill="x", pady=5)
-            except Exception as e:
-                print(f"Error copying log entry: {str(e)}")
+                reference = self.events[0].timestamp if len(self.events) else time.time()
+                since = clock_time(since_entry.get(), reference)
+                until = clock_time(until_entry.get(), reference, end=True)
+            except ValueError:
+                count_label.configure(text="Times are HH:MM or HH:MM:SS", text_color="#ff4444")
+                return
+            if not text.strip() and event_type == all_types and level == all_levels \
+                    and since is None and until is None:
+                log_list.set_source(self.events)
+                count_label.configure(text=f"{len(self.events)} events", text_color="#aaaaaa")
+                return
+            start = time.perf_counter()
+            indices = index.query(text, since, until,
+                                  None if event_type == all_types else [event_type],
+                                  None if level == all_levels else range(level_names[level], len(SEVERITIES)))
+            elapsed = time.perf_counter() - start
+            log_list.set_source(EventView(self.events, indices))
+            type_menu.configure(values=[all_types] + index.event_types())
+            count_label.configure(text=f"{len(indices)} of {index.count} events ({elapsed * 1000:.0f} ms)",
+                                  text_color="#aaaaaa")
+
+        for entry in (search_entry, since_entry, until_entry):
+            entry.bind("<KeyRelease>", schedule)
 
         popup.attributes('-topmost', True)
         popup.after(100, lambda: popup.attributes('-topmost', False))
 
     def init_camera(self):
+        """Open the first working camera; runs off the Tk thread, the UI tick shows the status"""
         for idx in [0, 1, 2]:
             try:
-                self.camera = cv2.VideoCapture(idx, cv2.CAP_DSHOW)
-                if self.camera.isOpened():
-                    self.status_label.configure(text=f"ACTIVE (Cam {idx})", 
-                                             text_color="#00ff00")
+                camera = cv2.VideoCapture(idx, cv2.CAP_DSHOW)
+                if camera.isOpened():
+                    with self.cam_lock:
+                        self.camera = camera
+                    self.camera_status = f"ACTIVE (Cam {idx})"
+                    self.startup_marks["camera"] = time.time()
                     return True
             except:
                 continue
-        self.status_label.configure(text="CAMERA OFFLINE", text_color="#ff0000")
+        self.camera_status = "CAMERA OFFLINE"
         return False
 
-    def update_frame(self, frame):
+    def start_monitoring(self):
+        """Open the camera and run the detector in the background so the window is usable at once"""
+        Thread(target=self.monitor, name="monitor", daemon=True).start()
+
+    def monitor(self):
         try:
-            if not self.running:
+            if not self.init_camera():
+                self.log_event("ERROR", "No camera could be opened; monitoring is not running")
                 return
-                
-            img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(img)
-            ctk_image = ctk.CTkImage(light_image=img, dark_image=img, size=(800, 600))
-            self.video_label.configure(image=ctk_image)
-            self.video_label.image = ctk_image
+            # Imported here: the detector pulls in pynput, NumPy analytics and the face models
+            from proctor import GoogolCheatingDetectorAI
+            proctor = GoogolCheatingDetectorAI(self)
+            self.attention = proctor.attention
+            proctor.monitor_environment()
         except Exception as e:
-            if self.running:
-                self.log_event("ERROR", f"Display: {str(e)}")
+            # The UI tick shows the status; without this the thread would die silently
+            self.camera_status = "MONITORING FAILED"
+            self.log_event("ERROR", f"Monitoring stopped: {str(e)}")
+            print(f"Monitoring stopped: {str(e)}")
+
+    def check_startup(self):
+        """Record when the first frame was painted; in probe mode report and exit"""
+        if "first_frame" in self.startup_marks or not self.display.paints:
+            return
+        self.startup_marks["first_frame"] = time.time()
+        if self.startup_probe:
+            line = "GTCD_STARTUP " + json.dumps(self.startup_marks)
+            if self.startup_probe == "-":
+                print(line, flush=True)
+            else:
+                # Windowed builds have no console, so the benchmark passes a file instead
+                with open(self.startup_probe, "w") as f:
+                    f.write(line + "\n")
+            self.on_close()
+
+    def update_frame(self, frame):
+        """Queue a frame for display; safe to call from the monitor threads"""
+        if self.running:
+            self.display.submit(frame)
+
+    def update_status(self, text):
+        """Latest detector status line (e.g. analysis rate); shown on the next UI tick"""
+        self.pipeline_status = text
 
     def log_event(self, event_type, message):
         """Thread-safe logging function"""
         if not self.running:
             return
-            
-        def _log():
-            try:
-                if "AI MODEL" in message or "CHEAT" in event_type:
-                    self.cheat_counter += 1
-                    self.counter_label.configure(text=f"AI ALERTS: {self.cheat_counter}")
-                    
-                    if self.cheat_counter % 10 == 0:
+        self.log_queue.push(self.events.append(event_type, message))
+
+    def flush_log_queue(self):
+        """UI tick: apply everything logged since the last tick in one batch"""
+        if not self.running:
+            return
+        try:
+            if not hasattr(self, "log_list"):
+                return  # UI is created once the API key has been entered
+            batch = self.log_queue.drain()
+            if batch:
+                drained_at = time.perf_counter()
+                for _, enqueued_at in batch:
+                    LOG_QUEUE_DELAY.observe(drained_at - enqueued_at)
+                alerts = 0
+                for index, _ in batch:
+                    event = self.events[index]
+                    if is_alert(event.event_type, event.message):
+                        alerts += 1
+
+                if alerts:
+                    previous = self.cheat_counter
+                    self.cheat_counter += alerts
+                    if self.cheat_counter // 10 > previous // 10:
                         winsound.Beep(1500, 1500)
-                        self.log_scroll._parent_canvas.yview_moveto(1.0)
+                        self.log_list.scroll_to_end()
 
-                entry_frame = ctk.CTkFrame(self.log_scroll, corner_radius=8, height=50)
-                color = "#ff4444" if "AI MODEL" in message else "#ffaa00"
-                entry_frame.configure(fg_color=color)
-                
-                timestamp = time.strftime("%H:%M:%S")
-                
-                ctk.CTkLabel(entry_frame, text=timestamp, width=150,
-                            font=("Consolas", 16, "bold")).pack(side="left", padx=15, pady=3)
-                ctk.CTkLabel(entry_frame, text=event_type, font=("Arial", 16, "bold"),
-                             width=220, text_color="#ffffff").pack(side="left", padx=15)
-                ctk.CTkLabel(entry_frame, text=message, font=("Arial", 16),
-                             wraplength=900, justify="left").pack(side="left", padx=15, fill="x", expand=True)
-                
-                self.log_entries.append(entry_frame)
-                if len(self.log_entries) > 100:
-                    old_entry = self.log_entries.pop(0)
-                    try:
-                        old_entry.destroy()
-                    except:
-                        pass
-                
-                entry_frame.pack(fill="x", pady=6, padx=5)
-                self.log_scroll._parent_canvas.update_idletasks()
-            except Exception as e:
-                print(f"Logging error: {str(e)}")
+                self.log_list.refresh()
+
+            counter_text = f"AI ALERTS: {self.cheat_counter}"
+            if self.log_queue.depth:
+                counter_text += f"  (+{self.log_queue.depth} queued)"
+            if self.counter_label.cget("text") != counter_text:
+                self.counter_label.configure(text=counter_text)
 
-        self.after(0, _log)
+            status_text = self.camera_status
+            if self.pipeline_status:
+                status_text += f"  |  {self.pipeline_status}"
+            if self.status_label.cget("text") != status_text:
+                color = "#ff0000" if self.camera_status in ("CAMERA OFFLINE", "MONITORING FAILED") else "#00ff00"
+                self.status_label.configure(text=status_text, text_color=color)
+            self.check_startup()
+            self.update_metrics_overlay()
+        except Exception as e:
+            print(f"Logging error: {str(e)}")
+        finally:
+            self.after(self.log_flush_interval, self.flush_log_queue)
 
     def on_close(self):
         """Graceful shutdown handler"""
         self.running = False
         try:
-            if self.camera and self.camera.isOpened():
-                self.camera.release()
+            if hasattr(self, "display"):
+                self.display.stop()
+            if self.journal:
+                self.journal.close()
+            if self.metrics_server:
+                self.metrics_server.stop()
+            with self.cam_lock:
+                if self.camera and self.camera.isOpened():
+                    self.camera.release()
             self.after(100, self.destroy)
         except:
             self.destroy()
 
-class GoogolCheatingDetectorAI:
-    def __init__(self, app):
-        self.app = app
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        )
-        self.focus_area = (200, 150, 600, 450)
-        self.listener = keyboard.Listener(on_press=self.on_key_press)
-        self.listener.start()
-        self.current_window = gw.getActiveWindow().title
-
-    def on_key_press(self, key):
-        try:
-            if key in [keyboard.Key.alt_l, keyboard.Key.cmd]:
-                self.app.log_event("AI ALERT", "LLM access attempt detected!")
-        except:
-            pass
-
-    def monitor_environment(self):
-        last_check = time.time()
-        
-        while self.app.running:
-            try:
-                with self.app.cam_lock:
-                    ret, frame = self.app.camera.read()
-                    if ret:
-                        processed = self.analyze_behavior(frame)
-                        self.app.update_frame(processed)
-
-                if time.time() - last_check > 0.3:
-                    current = gw.getActiveWindow().title
-                    if current != self.current_window:
-                        if any(browser in current for browser in ["Chrome", "Firefox", "Edge"]):
-                            self.app.log_event("CRITICAL ALERT", "SWITCHED TO AI MODEL-CHAT GPT!!")
-                        else:
-                            self.app.log_event("WARNING", f"Window changed to: {current}")
-                        self.current_window = current
-                    last_check = time.time()
-
-                time.sleep(0.1)
-            except Exception as e:
-                if self.app.running:
-                    self.app.log_event("ERROR", f"System error: {str(e)}")
-                time.sleep(1)
-
-    def analyze_behavior(self, frame):
-        frame = cv2.resize(frame, (800, 600))
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        cv2.rectangle(frame, (200, 150), (600, 450), (0, 255, 0), 4)
-        cv2.putText(frame, "FOCUS ZONE", (220, 130),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-
-        faces = self.face_cascade.detectMultiScale(gray, 1.1, 5)
-        if len(faces) > 0:
-            x, y, w, h = faces[0]
-            center = (x + w//2, y + h//2)
-            
-            cv2.line(frame, (400, 300), center, (0, 0, 255), 3)
-            distance = np.linalg.norm(np.array(center) - np.array([400, 300]))
-            
-            if distance > 150:
-                self.app.log_event("CHEAT DETECTED", "Significant attention deviation detected!")
-                cv2.putText(frame, "SECURITY BREACH!", (50, 80),
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 3)
-
-        return frame
-
 if __name__ == "__main__":
-    app = GoogolCheatingDetectorApp()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", type=float, metavar="SECONDS",
+                        help="profile CPU and memory for this long after startup")
+    parser.add_argument("--startup-probe", nargs="?", const="-", metavar="FILE",
+                        help="write launch milestones as JSON (stdout by default) once the first frame "
+                             "is painted, then exit")
+    args, _ = parser.parse_known_args()
+    app = GoogolCheatingDetectorApp(startup_probe=args.startup_probe)
+    if args.profile:
+        app.start_profiling(duration=args.profile)
     app.mainloop()
\ No newline at end of file
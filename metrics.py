@@ -0,0 +1,249 @@
+"""Low-overhead timing histograms and a Prometheus text endpoint
+
+Instrumented code records durations with registry.histogram(...).observe()
+or the timed() context manager; both cost a couple of perf_counter calls
+and a bisect. MetricsServer serves everything at /metrics in the
+Prometheus text exposition format, and summary_lines() gives a compact
+view for on-screen overlays.
+"""
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+
+# Seconds; spans sub-millisecond bookkeeping up to a stalled multi-second stage
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Bucketed distribution of observations (one label combination)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = Lock()
+
+    def observe(self, value):
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[slot] += 1
+            self.sum += value
+            self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (an estimate)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Family:
+    """A named metric with zero or more labels; children are created on first use"""
+
+    def __init__(self, kind, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.kind = kind
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.buckets = buckets
+        self.children = {}
+        self._lock = Lock()
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is None:
+            with self._lock:
+                child = self.children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        return Histogram(self.buckets) if self.kind == "histogram" else Value()
+
+    # Unlabelled families behave like their single child
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def set(self, value):
+        self.labels().set(value)
+
+
+class Value:
+    """Counter or gauge value"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def set(self, value):
+        self.value = value
+
+
+def _label_text(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.families = {}
+        self.callbacks = []
+        self._lock = Lock()
+
+    def _family(self, kind, name, help_text, labels, buckets=DEFAULT_BUCKETS):
+        family = self.families.get(name)
+        if family is None:
+            with self._lock:
+                family = self.families.setdefault(name, Family(kind, name, help_text, labels, buckets))
+        return family
+
+    def histogram(self, name, help_text="", labels=(), buckets=DEFAULT_BUCKETS):
+        return self._family("histogram", name, help_text, labels, buckets)
+
+    def counter(self, name, help_text="", labels=()):
+        return self._family("counter", name, help_text, labels)
+
+    def gauge(self, name, help_text="", labels=()):
+        return self._family("gauge", name, help_text, labels)
+
+    def collect_with(self, callback):
+        """Run `callback()` before every scrape, e.g. to copy stats() into gauges
+
+        Registering the same callback again is a no-op; owners that come and
+        go (a restarted monitor) call stop_collecting() so the registry does
+        not keep them alive.
+        """
+        with self._lock:
+            if callback not in self.callbacks:
+                self.callbacks.append(callback)
+
+    def stop_collecting(self, callback):
+        with self._lock:
+            if callback in self.callbacks:
+                self.callbacks.remove(callback)
+
+    def collect(self):
+        for callback in list(self.callbacks):
+            try:
+                callback()
+            except Exception as e:
+                print(f"Metrics callback error: {str(e)}")
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        self.collect()
+        lines = []
+        for family in list(self.families.values()):
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for values, child in list(family.children.items()):
+                if family.kind != "histogram":
+                    lines.append(f"{family.name}{_label_text(family.label_names, values)} "
+                                 f"{_number(child.value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(family.buckets + (float("inf"),), child.counts):
+                    cumulative += count
+                    labels = _label_text(family.label_names, values, ("le", _number(bound)))
+                    lines.append(f"{family.name}_bucket{labels} {cumulative}")
+                labels = _label_text(family.label_names, values)
+                lines.append(f"{family.name}_sum{labels} {_number(child.sum)}")
+                lines.append(f"{family.name}_count{labels} {child.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary_lines(self):
+        """One short line per timed series: mean and p90/p99 in milliseconds"""
+        lines = []
+        for family in list(self.families.values()):
+            if family.kind != "histogram":
+                continue
+            short = family.name.replace("gtcd_", "").replace("_seconds", "")
+            for values, child in sorted(family.children.items()):
+                if not child.count:
+                    continue
+                label = f"{short}[{','.join(values)}]" if values else short
+                lines.append(f"{label}: {child.sum / child.count * 1000:.1f}ms avg, "
+                             f"p90<{child.quantile(0.9) * 1000:g} p99<{child.quantile(0.99) * 1000:g}ms")
+        return lines
+
+
+class timed:
+    """Context manager that observes the elapsed seconds into a histogram"""
+
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class MetricsServer:
+    """Serves registry.render() at http://host:port/metrics on a daemon thread"""
+
+    def __init__(self, registry, host="127.0.0.1", port=9464):
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split("?")[0] not in ("/metrics", "/"):
+                    handler.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                handler.send_response(200)
+                handler.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = None
+
+    def start(self):
+        self._thread = Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# Process-wide registry shared by the engine and the UI
+registry = MetricsRegistry()
@@ -0,0 +1,77 @@
+import time
+
+import cv2
+
+
+class MotionGate:
+    """Decides whether a frame changed enough to be worth running face detection
+
+    Each grayscale frame is shrunk to `size` (a few thousand pixels) and
+    compared with the thumbnail of the last frame that was actually analysed.
+    The score is the mean absolute difference in grey levels; below
+    `threshold` the scene is considered static and the caller can reuse its
+    previous result. Comparing against the last analysed frame rather than the
+    previous one means slow drift still adds up and eventually triggers a
+    detection, and `max_skip` forces one regardless so a stale result never
+    lives for long.
+    """
+
+    def __init__(self, size=(80, 60), threshold=4.0, max_skip=30):
+        self.size = size
+        self.threshold = threshold
+        self.max_skip = max_skip
+        self.reference = None
+        self.skipped_in_row = 0
+
+        self.frames = 0
+        self.skipped = 0
+        self.forced = 0
+        self.compared = 0
+        self.score_total = 0.0
+        self.gate_time = 0.0
+
+    def reset(self):
+        """Forget the reference frame; the next frame always passes"""
+        self.reference = None
+        self.skipped_in_row = 0
+
+    def score(self, thumbnail):
+        if self.reference is None:
+            return float("inf")
+        return float(cv2.absdiff(thumbnail, self.reference).mean())
+
+    def changed(self, gray):
+        """True when `gray` should be analysed, False when the last result still holds"""
+        start = time.perf_counter()
+        self.frames += 1
+        thumbnail = cv2.resize(gray, self.size, interpolation=cv2.INTER_AREA)
+        score = self.score(thumbnail)
+        if self.reference is not None:
+            self.compared += 1
+            self.score_total += score
+
+        passed = True
+        if score < self.threshold:
+            if self.skipped_in_row < self.max_skip:
+                passed = False
+            else:
+                self.forced += 1
+
+        if passed:
+            self.reference = thumbnail
+            self.skipped_in_row = 0
+        else:
+            self.skipped += 1
+            self.skipped_in_row += 1
+        self.gate_time += time.perf_counter() - start
+        return passed
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "detections_skipped": self.skipped,
+            "skip_ratio": self.skipped / self.frames if self.frames else 0.0,
+            "forced_detections": self.forced,
+            "mean_score": self.score_total / self.compared if self.compared else 0.0,
+            "avg_gate_ms": self.gate_time / self.frames * 1000 if self.frames else 0.0,
+        }
@@ -0,0 +1,272 @@
+"""Multi-candidate mode: one host analysing many camera streams
+
+Streams are spread over worker processes (one detector per stream, so all
+per-stream state stays in the worker that owns it). Inside a worker the
+streams are scheduled earliest-deadline-first at `stream_fps`, so a busy
+stream cannot starve the others, and sources that behave like live feeds
+simply drop the frames a late stream missed. Events come back to the parent
+tagged with their stream id and are routed to that stream's sinks.
+"""
+import argparse
+import heapq
+import multiprocessing as mp
+import os
+import queue
+import time
+
+from sinks import CallbackSink, MemorySink
+
+
+class SyntheticSource:
+    """Local stand-in for a network camera feed: a blob drifting over noise"""
+
+    def __init__(self, width=640, height=480, seed=0):
+        import numpy as np
+
+        self.width, self.height = width, height
+        rng = np.random.default_rng(seed)
+        self.background = rng.integers(0, 60, (height, width, 3), dtype=np.uint8)
+        self.phase = seed * 7
+        self.frames = 0
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        import cv2
+        import numpy as np
+
+        frame = self.background.copy()
+        t = (self.phase + self.frames) / 25.0
+        cx = int(self.width / 2 + self.width / 4 * np.sin(t))
+        cy = int(self.height / 2 + self.height / 8 * np.cos(t / 1.6))
+        cv2.ellipse(frame, (cx, cy), (self.width // 12, self.height // 8), 0, 0, 360,
+                    (170, 190, 220), -1)
+        self.frames += 1
+        return True, frame
+
+    def release(self):
+        pass
+
+
+class LiveVideoSource:
+    """Plays a video file against the wall clock, like a live feed
+
+    read() returns the frame that is "on air" now; frames the reader was too
+    slow for are skipped with grab(), exactly as they would be lost on a
+    network stream. With loop=True the file restarts at the end.
+    """
+
+    def __init__(self, path, loop=True):
+        import cv2
+
+        self.path = path
+        self.loop = loop
+        self.capture = cv2.VideoCapture(path)
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+        self.started = time.perf_counter()
+        self.position = 0
+        self.skipped = 0
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self):
+        due = int((time.perf_counter() - self.started) * self.fps)
+        while self.position < due and self.capture.grab():
+            self.position += 1
+            self.skipped += 1
+        ret, frame = self.capture.read()
+        if not ret and self.loop:
+            self._rewind()
+            ret, frame = self.capture.read()
+        if ret:
+            self.position += 1
+        return ret, frame
+
+    def _rewind(self):
+        import cv2
+
+        self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self.started = time.perf_counter()
+        self.position = 0
+
+    def release(self):
+        self.capture.release()
+
+
+def open_source(spec, seed=0):
+    """"synthetic[:WxH]", a device index, a device path or a video file"""
+    import cv2
+
+    if spec.startswith("synthetic"):
+        width, height = 640, 480
+        if ":" in spec:
+            width, height = (int(v) for v in spec.split(":", 1)[1].lower().split("x"))
+        return SyntheticSource(width, height, seed=seed)
+    if spec.isdigit():
+        return cv2.VideoCapture(int(spec))
+    if spec.startswith("/dev/"):
+        return cv2.VideoCapture(spec)
+    return LiveVideoSource(spec)
+
+
+def _worker(worker_id, assigned, stream_fps, detector_options, events, results, stop):
+    """Worker process: analyse the assigned (stream_id, spec) pairs until stopped"""
+    import cv2
+    from proctor import GoogolCheatingDetectorAI
+
+    # Parallelism comes from the worker processes; OpenCV's own thread pool
+    # in every one of them would only oversubscribe the cores
+    cv2.setNumThreads(1)
+    period = 1.0 / stream_fps if stream_fps else 0.0
+    streams = {}
+    schedule = []
+    now = time.perf_counter()
+    for stream_id, spec in assigned:
+        sink = CallbackSink(lambda event_type, message, sid=stream_id:
+                            events.put((sid, time.time(), event_type, message)))
+        detector = GoogolCheatingDetectorAI(sinks=[sink], monitor_inputs=False, **detector_options)
+        streams[stream_id] = {"source": open_source(spec, seed=stream_id), "detector": detector,
+                              "frames": 0, "late": 0.0, "busy": 0.0}
+        heapq.heappush(schedule, (now, stream_id))
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    while schedule and not stop.is_set():
+        due, stream_id = heapq.heappop(schedule)
+        now = time.perf_counter()
+        if due > now:
+            time.sleep(due - now)
+            now = time.perf_counter()
+        state = streams[stream_id]
+        ret, frame = state["source"].read()
+        if not ret:
+            events.put((stream_id, time.time(), "WARNING", "Stream ended"))
+            continue
+        state["late"] += max(0.0, now - due)
+        state["detector"].analyze_behavior(frame)
+        state["frames"] += 1
+        state["busy"] += time.perf_counter() - now
+        # Next slot is relative to the old deadline, but never in the past:
+        # a stream that fell behind drops frames rather than bursting
+        heapq.heappush(schedule, (max(due + period, time.perf_counter()), stream_id))
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    per_stream = {}
+    for stream_id, state in streams.items():
+        state["source"].release()
+        state["detector"].report_episode(state["detector"].episodes.flush(time.time()))
+        per_stream[stream_id] = {
+            "frames": state["frames"],
+            "fps": state["frames"] / wall if wall else 0.0,
+            "mean_lateness_ms": state["late"] / state["frames"] * 1000 if state["frames"] else 0.0,
+            "mean_analysis_ms": state["busy"] / state["frames"] * 1000 if state["frames"] else 0.0,
+        }
+    results.put((worker_id, {"wall_seconds": wall, "cpu_seconds": cpu, "streams": per_stream}))
+
+
+class MultiStreamProctor:
+    """Fans streams out over worker processes and routes their events back
+
+    `sinks_for(stream_id)` returns the sinks for one stream; by default each
+    stream gets its own MemorySink, available as `self.sinks[stream_id]`.
+    """
+
+    def __init__(self, sources, workers=None, stream_fps=10, sinks_for=None, **detector_options):
+        self.sources = list(sources)
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(self.sources)))
+        self.stream_fps = stream_fps
+        self.detector_options = detector_options
+        self.sinks = {}
+        for stream_id in range(len(self.sources)):
+            self.sinks[stream_id] = sinks_for(stream_id) if sinks_for else [MemorySink()]
+        self._context = mp.get_context("spawn")
+        self._events = self._context.Queue()
+        self._results = self._context.Queue()
+        self._stop = self._context.Event()
+        self._processes = []
+        self.worker_results = {}
+        self.routed = 0
+
+    def assignment(self):
+        """Round-robin so every worker gets within one stream of the same load"""
+        assigned = [[] for _ in range(self.workers)]
+        for stream_id, spec in enumerate(self.sources):
+            assigned[stream_id % self.workers].append((stream_id, spec))
+        return assigned
+
+    def start(self):
+        for worker_id, assigned in enumerate(self.assignment()):
+            process = self._context.Process(
+                target=_worker, name=f"gtcd-worker-{worker_id}",
+                args=(worker_id, assigned, self.stream_fps, self.detector_options,
+                      self._events, self._results, self._stop),
+                daemon=True)
+            process.start()
+            self._processes.append(process)
+
+    def pump(self, timeout=0.1):
+        """Route pending events to their stream's sinks; returns how many were routed"""
+        routed = 0
+        try:
+            while True:
+                stream_id, _, event_type, message = self._events.get(timeout=timeout if not routed else 0)
+                for sink in self.sinks[stream_id]:
+                    sink.log_event(event_type, message)
+                routed += 1
+        except queue.Empty:
+            pass
+        self.routed += routed
+        return routed
+
+    def run(self, duration):
+        self.start()
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline and any(p.is_alive() for p in self._processes):
+            self.pump()
+        return self.stop()
+
+    def stop(self):
+        """Stop the workers and return their per-stream results"""
+        self._stop.set()
+        while len(self.worker_results) < len(self._processes):
+            self.pump(timeout=0)
+            try:
+                worker_id, result = self._results.get(timeout=0.1)
+                self.worker_results[worker_id] = result
+            except queue.Empty:
+                if not any(p.is_alive() for p in self._processes) and self._results.empty():
+                    break
+        for process in self._processes:
+            process.join(timeout=5)
+        self.pump(timeout=0)
+        return self.worker_results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", action="append", required=True,
+                        help="video file, device index/path or synthetic[:WxH]; repeat per candidate")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--stream-fps", type=float, default=10)
+    parser.add_argument("--duration", type=float, default=60)
+    args = parser.parse_args(argv)
+
+    def sinks_for(stream_id):
+        prefix = f"[stream {stream_id}]"
+        return [MemorySink(), CallbackSink(lambda event_type, message:
+                                           print(f"{prefix} {time.strftime('%H:%M:%S')} - {event_type}: {message}"))]
+
+    proctor = MultiStreamProctor(args.source, workers=args.workers, stream_fps=args.stream_fps,
+                                 sinks_for=sinks_for)
+    results = proctor.run(args.duration)
+    for worker_id, result in sorted(results.items()):
+        for stream_id, stream in sorted(result["streams"].items()):
+            print(f"worker {worker_id} stream {stream_id}: {stream['fps']:.1f} fps, "
+                  f"{stream['mean_analysis_ms']:.1f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
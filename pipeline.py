@@ -0,0 +1,278 @@
+import os
+import time
+from threading import Thread, Condition
+
+from metrics import registry, timed
+
+STAGE_SECONDS = registry.histogram(
+    "gtcd_stage_seconds", "Work done per frame by each pipeline stage", labels=("stage",))
+
+
+class FrameRing:
+    """Small ring buffer of frames where readers always take the newest one
+
+    Writers never block: once the ring is full the oldest slot is overwritten.
+    Each reader tracks the last sequence number it saw, so frames a reader
+    never got to are counted as dropped for that reader.
+    """
+
+    def __init__(self, capacity=2):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._seq = 0
+        self._cond = Condition()
+        self._last_read = {}
+        self.dropped = {}
+
+    def put(self, frame):
+        with self._cond:
+            self._seq += 1
+            self._slots[self._seq % self.capacity] = (self._seq, time.perf_counter(), frame)
+            self._cond.notify_all()
+            return self._seq
+
+    def latest(self, reader, timeout=None):
+        """Return (seq, captured_at, frame) newer than what `reader` last saw, or None"""
+        with self._cond:
+            last = self._last_read.get(reader, 0)
+            if self._seq <= last:
+                self._cond.wait(timeout)
+                if self._seq <= last:
+                    return None
+            seq, captured_at, frame = self._slots[self._seq % self.capacity]
+            if last and seq - last > 1:
+                self.dropped[reader] = self.dropped.get(reader, 0) + seq - last - 1
+            self._last_read[reader] = seq
+            return seq, captured_at, frame
+
+    @property
+    def produced(self):
+        return self._seq
+
+    def wake(self):
+        """Release any reader blocked in latest()"""
+        with self._cond:
+            self._cond.notify_all()
+
+
+class AdaptiveRate:
+    """Frame-rate scheduler for the analysis stage
+
+    Runs at `target_fps` normally, drops to `idle_fps` once the scene has
+    been stable (face present and centred) for `idle_after` seconds, and
+    jumps to `max_fps` for `boost_for` seconds whenever activity() is
+    signalled (a deviation, a window switch). Independently of the mode it
+    backs off when the stage cannot finish its work within the period or
+    the process is using more than `cpu_limit` of the machine, and recovers
+    gradually once there is headroom again.
+    """
+
+    def __init__(self, target_fps=10, idle_fps=3, max_fps=20, idle_after=3.0, boost_for=5.0,
+                 cpu_limit=0.85, min_fps=1):
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.max_fps = max_fps
+        self.min_fps = min_fps
+        self.idle_after = idle_after
+        self.boost_for = boost_for
+        self.cpu_limit = cpu_limit
+        self.backoff = 1.0
+        self.mode = "active"
+        self.effective_fps = 0.0
+        self._stable_since = None
+        self._boost_until = 0.0
+        self._last_iteration = None
+        self._cpu_mark = (time.perf_counter(), time.process_time())
+        self._cores = os.cpu_count() or 1
+
+    def activity(self):
+        """Something suspicious started: analyse at full rate for a while"""
+        self._boost_until = time.perf_counter() + self.boost_for
+        self._stable_since = None
+
+    def stable(self, is_stable):
+        """Report whether the latest frame looked calm (face present and centred)"""
+        if not is_stable:
+            self._stable_since = None
+        elif self._stable_since is None:
+            self._stable_since = time.perf_counter()
+
+    def rate(self):
+        now = time.perf_counter()
+        if now < self._boost_until:
+            self.mode, fps = "boost", self.max_fps
+        elif self._stable_since is not None and now - self._stable_since >= self.idle_after:
+            self.mode, fps = "idle", self.idle_fps
+        else:
+            self.mode, fps = "active", self.target_fps
+        return max(self.min_fps, fps * self.backoff)
+
+    def period(self):
+        return 1.0 / self.rate()
+
+    def record(self, work_seconds, period):
+        """Account for one iteration that took `work_seconds` of a `period` slot"""
+        now = time.perf_counter()
+        if self._last_iteration is not None:
+            interval = now - self._last_iteration
+            if interval > 0:
+                self.effective_fps = 0.8 * self.effective_fps + 0.2 / interval if self.effective_fps \
+                    else 1.0 / interval
+        self._last_iteration = now
+
+        saturated = work_seconds > period * 0.9
+        wall_mark, cpu_mark = self._cpu_mark
+        if now - wall_mark >= 1.0:
+            cpu = time.process_time()
+            utilisation = (cpu - cpu_mark) / ((now - wall_mark) * self._cores)
+            saturated = saturated or utilisation > self.cpu_limit
+            self._cpu_mark = (now, cpu)
+        if saturated:
+            self.backoff = max(0.1, self.backoff * 0.8)
+        elif self.backoff < 1.0:
+            self.backoff = min(1.0, self.backoff * 1.05)
+
+    def describe(self):
+        text = f"{self.effective_fps:.1f} FPS {self.mode}"
+        if self.backoff < 1.0:
+            text += " (CPU backoff)"
+        return text
+
+
+class Stage(Thread):
+    """Daemon thread that calls `step` at most `rate` times per second
+
+    A rate of None runs `step` back to back, which suits stages that
+    already block on something (camera reads, a FrameRing). `rate` may also
+    be an AdaptiveRate, which is asked for the period before every sleep
+    and told how long each iteration's work took.
+    """
+
+    def __init__(self, name, step, rate, is_running, on_error=None):
+        super().__init__(name=name, daemon=True)
+        self.step = step
+        self.scheduler = rate if isinstance(rate, AdaptiveRate) else None
+        self.period = 1.0 / rate if rate and self.scheduler is None else 0
+        self.is_running = is_running
+        self.on_error = on_error
+        self.iterations = 0
+
+    def run(self):
+        next_tick = time.perf_counter()
+        while self.is_running():
+            started = time.perf_counter()
+            try:
+                self.step()
+                self.iterations += 1
+            except Exception as e:
+                if self.on_error and self.is_running():
+                    self.on_error(self.name, e)
+                time.sleep(1)
+                next_tick = time.perf_counter()
+                continue
+
+            if self.scheduler is not None:
+                # Judge the work against the slot it actually ran in, then reschedule
+                ran_under = self.period or self.scheduler.period()
+                self.scheduler.record(time.perf_counter() - started, ran_under)
+                self.period = self.scheduler.period()
+            if self.period:
+                next_tick += self.period
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Fell behind: don't try to catch up with a burst of iterations
+                    next_tick = time.perf_counter()
+
+
+class MonitoringPipeline:
+    """Capture -> analysis -> render stages connected by frame-dropping rings
+
+    `read` returns (ok, frame) like cv2.VideoCapture.read, `analyze` turns a raw
+    frame into an annotated one and `render` displays it. Each stage runs on
+    its own thread at its own rate; a slow analysis pass only ever sees the
+    newest captured frame instead of a backlog of stale ones.
+
+    Cameras block in read(), so capture runs unpaced by default. Video files
+    don't, and need `capture_fps` (their native rate) and `end_of_stream`,
+    which stops every stage at the first failed read instead of retrying.
+    """
+
+    def __init__(self, read, analyze, render, is_running,
+                 analysis_fps=10, render_fps=30, on_error=None, capture_fps=None, end_of_stream=False):
+        self.read = read
+        self.analyze = analyze
+        self.render = render
+        self.end_of_stream = end_of_stream
+        self.ended = False
+        source_running = is_running
+        self.is_running = is_running = lambda: not self.ended and source_running()
+        self.captured = FrameRing()
+        self.processed = FrameRing()
+        self.read_failures = 0
+        self.analysed = 0
+        self.rendered = 0
+        self._timers = {name: STAGE_SECONDS.labels(name) for name in ("capture", "analysis", "render")}
+        self.stages = [
+            Stage("capture", self._capture, capture_fps, is_running, on_error),
+            Stage("analysis", self._analyse, analysis_fps, is_running, on_error),
+        ]
+        # Headless runs with nothing to display skip rendering altogether
+        if render is not None:
+            self.stages.append(Stage("render", self._render, render_fps, is_running, on_error))
+
+    def add_stage(self, name, step, rate):
+        """Run an extra periodic job (e.g. window polling) alongside the frame stages"""
+        stage = Stage(name, step, rate, self.is_running, self.stages[0].on_error)
+        self.stages.append(stage)
+        return stage
+
+    def _capture(self):
+        with timed(self._timers["capture"]):
+            ret, frame = self.read()
+        if ret:
+            self.captured.put(frame)
+        elif self.end_of_stream:
+            self.ended = True
+        else:
+            self.read_failures += 1
+            time.sleep(0.05)
+
+    def _analyse(self):
+        item = self.captured.latest("analysis", timeout=0.5)
+        if item is not None:
+            with timed(self._timers["analysis"]):
+                processed = self.analyze(item[2])
+            self.analysed += 1
+            if self.render is not None:
+                self.processed.put(processed)
+
+    def _render(self):
+        item = self.processed.latest("render", timeout=0.5)
+        if item is not None:
+            with timed(self._timers["render"]):
+                self.render(item[2])
+            self.rendered += 1
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def join(self):
+        # Stages blocked in FrameRing.latest() only notice a stop once woken
+        self.captured.wake()
+        self.processed.wake()
+        for stage in self.stages:
+            stage.join()
+
+    def stats(self):
+        """Counters for each stage and how many frames each consumer skipped"""
+        return {
+            "captured": self.captured.produced,
+            "analysed": self.analysed,
+            "rendered": self.rendered,
+            "dropped_before_analysis": self.captured.dropped.get("analysis", 0),
+            "dropped_before_render": self.processed.dropped.get("render", 0),
+            "read_failures": self.read_failures,
+        }
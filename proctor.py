@@ -0,0 +1,378 @@
+import argparse
+import os
+import cv2
+import time
+from threading import Lock, Thread
+
+from pipeline import AdaptiveRate, MonitoringPipeline
+from tracking import FaceTracker
+from detectors import create_detector
+from motion import MotionGate
+from episodes import EpisodeTracker
+from attention import AttentionWindow
+from sinks import CallbackSink, FileSink, MemorySink
+from focus import WindowFocusMonitor, default_backend
+from evidence import EvidenceRecorder
+from keys import KeyAnalyzer, KeyboardMonitor
+from metrics import registry, timed, MetricsServer
+from profiling import ProfileSession, profile_directory
+
+ANALYSIS_STEP_SECONDS = registry.histogram(
+    "gtcd_analysis_step_seconds", "Time per frame in each part of analyze_behavior", labels=("step",))
+LOG_EVENT_SECONDS = registry.histogram("gtcd_log_event_seconds", "Time to hand one event to every sink")
+EVENTS_LOGGED = registry.counter("gtcd_events_total", "Events logged, by event type", labels=("type",))
+PIPELINE_FRAMES = registry.gauge("gtcd_pipeline_frames", "Frame counters of the monitoring pipeline",
+                                 labels=("counter",))
+ANALYSIS_FPS = registry.gauge("gtcd_analysis_fps", "Effective analysis frame rate")
+
+
+class GoogolCheatingDetectorAI:
+    """Detection engine: camera analysis, window and key monitoring
+
+    Results go to `sinks` (see sinks.py). Passing the Tk app keeps the
+    original wiring: the app becomes a sink and its camera, lock and running
+    flag are used. Without an app the engine is headless: give it a
+    `camera` (anything with read()/isOpened()) and call stop() to finish.
+    """
+
+    def __init__(self, app=None, sinks=None, camera=None, analysis_fps=10, render_fps=30,
+                 window_poll_interval=0.1, focus_backend=None, track_faces=True, rescan_interval=15,
+                 deviation_threshold=150, deviation_hysteresis=30, min_episode_duration=1.0,
+                 episode_close_grace=1.0, monitor_inputs=True, adaptive_rate=True, idle_fps=3,
+                 max_fps=20, idle_after=3.0, motion_gate=True, motion_threshold=4.0, motion_max_skip=30,
+                 detector="haar", detector_options=None, detector_threads=None, attention_window=5.0,
+                 attention_smoothing=0.5, missing_face_ratio=0.9, evidence_dir=None, evidence_seconds=(5.0, 5.0),
+                 evidence_max_mb=48, file_source=False):
+        self.app = app
+        self.sinks = list(sinks or [])
+        if app is not None:
+            self.sinks.append(app)
+        self.camera = camera
+        # A video file is replayed at its own frame rate and ends the session at its last frame
+        self.file_source = file_source
+        self.cam_lock = app.cam_lock if app is not None else Lock()
+        self._running = True
+        self.face_detector = create_detector(detector, threads=detector_threads,
+                                             **(detector_options or {}))
+        # With rescan_interval=0 every frame gets a full-frame scan, as before
+        self.tracker = FaceTracker(self.face_detector,
+                                   rescan_interval=rescan_interval if track_faces else 0)
+        # Static frames reuse the previous face result instead of running the cascade
+        self.gate = MotionGate(threshold=motion_threshold, max_skip=motion_max_skip) if motion_gate else None
+        self.last_faces = []
+        self.focus_area = (200, 150, 600, 450)
+        # Alerts are judged on rolling metrics rather than a single frame's distance
+        self.attention = AttentionWindow(window=attention_window, smoothing=attention_smoothing,
+                                         center=(400, 300), zone=self.focus_area)
+        self.missing_face_ratio = missing_face_ratio
+        self.face_missing = False
+        self.episodes = EpisodeTracker(open_threshold=deviation_threshold,
+                                       close_threshold=deviation_threshold - deviation_hysteresis,
+                                       min_duration=min_episode_duration,
+                                       close_grace=episode_close_grace)
+        self.analysis_fps = analysis_fps
+        # Analysis slows down while the candidate sits still and speeds up on anything suspicious
+        self.rate = AdaptiveRate(target_fps=analysis_fps, idle_fps=idle_fps, max_fps=max_fps,
+                                 idle_after=idle_after) if adaptive_rate else None
+        self.render_fps = render_fps
+        self.window_poll_interval = window_poll_interval
+        self.focus_backend = focus_backend
+        self.pipeline = None
+        # Clips go next to the app's session journal unless a directory is given
+        journal = getattr(app, "journal", None)
+        if evidence_dir is None and journal is not None:
+            evidence_dir = os.path.join(os.path.dirname(journal.directory), "evidence")
+        self.evidence = None
+        if evidence_dir:
+            self.evidence = EvidenceRecorder(evidence_dir, pre_seconds=evidence_seconds[0],
+                                             post_seconds=evidence_seconds[1],
+                                             max_bytes=int(evidence_max_mb * 1024 * 1024),
+                                             on_saved=self.on_evidence_saved)
+        self._step_timers = {step: ANALYSIS_STEP_SECONDS.labels(step)
+                             for step in ("preprocess", "detect", "attention", "draw")}
+        self.listener = None
+        self.keys = None
+        self.focus = None
+        # Headless callers (benchmarks, tests) skip the OS keyboard and window hooks
+        if monitor_inputs:
+            self.start_input_monitoring()
+
+    def start_input_monitoring(self):
+        # Imported here so analyze_behavior can run on machines without a desktop session
+        from pynput import keyboard
+        # The listener thread only queues key events; chords are recognised on their own thread
+        self.keys = KeyboardMonitor(KeyAnalyzer(self.log_event)).start()
+        self.listener = keyboard.Listener(on_press=self.keys.on_press, on_release=self.keys.on_release)
+        self.listener.start()
+        backend = self.focus_backend or default_backend(self.window_poll_interval)
+        self.focus = WindowFocusMonitor(self.on_window_change, backend).start()
+
+    @property
+    def current_window(self):
+        return self.focus.current if self.focus else None
+
+    @property
+    def running(self):
+        return self._running and (self.app is None or self.app.running)
+
+    def stop(self):
+        self._running = False
+        if self.listener is not None:
+            self.listener.stop()
+        if self.keys is not None:
+            self.keys.stop()
+        if self.focus is not None:
+            self.focus.stop()
+
+    def log_event(self, event_type, message):
+        with timed(LOG_EVENT_SECONDS):
+            for sink in self.sinks:
+                sink.log_event(event_type, message)
+        EVENTS_LOGGED.labels(event_type).inc()
+
+    def publish_frame(self, frame):
+        for sink in self.sinks:
+            if getattr(sink, "wants_frames", True):
+                sink.update_frame(frame)
+
+    def publish_status(self):
+        """Tell sinks the effective analysis rate (shown in the app's status bar)"""
+        if self.rate is None:
+            return
+        text = self.rate.describe()
+        for sink in self.sinks:
+            if hasattr(sink, "update_status"):
+                sink.update_status(text)
+
+    def read_camera(self):
+        """Grab a single frame; the lock only guards the camera handle itself"""
+        with self.cam_lock:
+            camera = self.camera if self.camera is not None else getattr(self.app, "camera", None)
+            if not camera or not camera.isOpened():
+                return False, None
+            ret, frame = camera.read()
+        if ret and self.evidence is not None:
+            self.evidence.add(frame)
+        return ret, frame
+
+    def on_evidence_saved(self, path, incident, frames):
+        self.log_event("INFO", f"Evidence clip saved: {path} ({frames} frames)")
+
+    def on_window_change(self, transition):
+        """Called on the focus monitor's thread for every foreground-window switch"""
+        current = transition.title
+        if self.rate is not None:
+            self.rate.activity()
+        if any(browser in current for browser in ["Chrome", "Firefox", "Edge"]):
+            self.log_event("CRITICAL ALERT", "SWITCHED TO AI MODEL-CHAT GPT!!")
+            if self.evidence is not None:
+                self.evidence.trigger("ai model window", transition.occurred_at)
+        else:
+            self.log_event("WARNING", f"Window changed to: {current}")
+
+    def on_stage_error(self, stage, error):
+        self.log_event("ERROR", f"System error ({stage}): {str(error)}")
+
+    def monitor_environment(self):
+        """Run capture, analysis and rendering as separate stages until stopped"""
+        wants_frames = any(getattr(sink, "wants_frames", True) for sink in self.sinks)
+        capture_fps = None
+        if self.file_source and self.camera is not None:
+            capture_fps = self.camera.get(cv2.CAP_PROP_FPS) or 30
+        self.pipeline = MonitoringPipeline(
+            read=self.read_camera,
+            analyze=self.analyze_behavior,
+            render=self.publish_frame if wants_frames else None,
+            is_running=lambda: self.running,
+            analysis_fps=self.rate or self.analysis_fps,
+            render_fps=self.render_fps,
+            on_error=self.on_stage_error,
+            capture_fps=capture_fps,
+            end_of_stream=self.file_source,
+        )
+        if self.rate is not None:
+            self.pipeline.add_stage("status", self.publish_status, 1)
+        registry.collect_with(self.export_metrics)
+        if self.evidence is not None:
+            self.evidence.start()
+        try:
+            self.pipeline.start()
+            self.pipeline.join()
+        finally:
+            # Also on Ctrl+C: stages finish before the open episode and evidence are flushed
+            self.stop()
+            self.pipeline.join()
+            self.report_episode(self.episodes.flush(time.time()))
+            if self.evidence is not None:
+                self.evidence.close()
+            registry.stop_collecting(self.export_metrics)
+
+    def export_metrics(self):
+        """Copy pipeline counters into gauges before each metrics scrape"""
+        if self.pipeline is not None:
+            for name, value in self.pipeline.stats().items():
+                PIPELINE_FRAMES.labels(name).set(value)
+        if self.rate is not None:
+            ANALYSIS_FPS.set(self.rate.effective_fps)
+
+    def stats(self):
+        """Pipeline frame counters, analysis rate, detection savings and window-switch latency"""
+        stats = self.pipeline.stats() if self.pipeline else {}
+        stats.update({f"face_{k}": v for k, v in self.tracker.stats().items()})
+        stats.update({f"attention_{k}": v for k, v in self.attention.report().items()})
+        if self.evidence is not None:
+            stats.update({f"evidence_{k}": v for k, v in self.evidence.stats().items()})
+        if self.gate is not None:
+            stats.update({f"motion_{k}": v for k, v in self.gate.stats().items()})
+        if self.rate is not None:
+            stats.update({"analysis_fps_effective": self.rate.effective_fps,
+                          "analysis_mode": self.rate.mode, "analysis_backoff": self.rate.backoff})
+        if self.keys:
+            stats.update({f"keys_{k}": v for k, v in self.keys.stats().items()})
+        if self.focus:
+            stats.update({f"focus_{k}": v for k, v in self.focus.stats().items()})
+        return stats
+
+    def report_episode(self, change):
+        """Log one entry when a deviation episode starts and one when it ends"""
+        if change is None:
+            return
+        kind, episode = change
+        if kind == "open":
+            self.log_event("CHEAT DETECTED", "Significant attention deviation detected!")
+            if self.evidence is not None:
+                self.evidence.trigger("security breach", episode.started)
+        else:
+            self.log_event("DEVIATION ENDED", episode.describe())
+
+    def check_face_missing(self, metrics):
+        """Warn once when the face has been gone for most of the attention window"""
+        if not self.face_missing and metrics["missing_ratio"] >= self.missing_face_ratio \
+                and self.attention.observed_seconds >= self.attention.window:
+            self.face_missing = True
+            self.log_event("WARNING", f"Face not visible for most of the last {self.attention.window:.0f}s")
+        elif self.face_missing and metrics["missing_ratio"] < 0.5:
+            self.face_missing = False
+
+    def analyze_behavior(self, frame):
+        timers = self._step_timers
+        start = time.perf_counter()
+        frame = cv2.resize(frame, (800, 600))
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        mark = time.perf_counter()
+        timers["preprocess"].observe(mark - start)
+
+        # Detect before drawing so colour detectors never see the overlay
+        if self.gate is None or self.gate.changed(gray):
+            self.last_faces = self.tracker.detect(gray, frame)
+        faces = self.last_faces
+        start, mark = mark, time.perf_counter()
+        timers["detect"].observe(mark - start)
+
+        cv2.rectangle(frame, (200, 150), (600, 450), (0, 255, 0), 4)
+        cv2.putText(frame, "FOCUS ZONE", (220, 130),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+        box = None
+        if len(faces) > 0:
+            box = x, y, w, h = faces[0]
+            center = (x + w//2, y + h//2)
+
+            cv2.line(frame, (400, 300), center, (0, 0, 255), 3)
+        start, mark = mark, time.perf_counter()
+        timers["draw"].observe(mark - start)
+
+        now = time.time()
+        self.attention.push(now, box)
+        metrics = self.attention.metrics(now)
+        distance = metrics["smoothed_offset"]
+        self.report_episode(self.episodes.update(distance, now))
+        self.check_face_missing(metrics)
+        if self.rate is not None:
+            if self.episodes.active or (distance is not None and distance > self.episodes.close_threshold):
+                self.rate.activity()
+            else:
+                # Calm means a face is visible and well inside the focus zone
+                self.rate.stable(distance is not None and distance < self.episodes.close_threshold / 2)
+        timers["attention"].observe(time.perf_counter() - mark)
+        if self.episodes.active and self.episodes.current.reported:
+            cv2.putText(frame, "SECURITY BREACH!", (50, 80),
+                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 3)
+
+        return frame
+
+
+def print_event(event_type, message):
+    print(f"{time.strftime('%H:%M:%S')} - {event_type}: {message}")
+
+
+def main(argv=None):
+    """Headless proctoring: no Tk window, events go to stdout and optional files"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--source", default="0", help="camera index or video file")
+    parser.add_argument("--log-file", help="append events to this text file")
+    parser.add_argument("--journal", action="store_true", help="also journal events under sessions/")
+    parser.add_argument("--profile", type=float, metavar="SECONDS",
+                        help="profile CPU and memory for this long after startup")
+    parser.add_argument("--profile-dir", default="profiles", help="where profiling results go")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on localhost:PORT")
+    parser.add_argument("--evidence-dir", help="save video clips around alerts to this directory")
+    parser.add_argument("--no-inputs", action="store_true", help="skip window and keyboard monitoring")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--analysis-fps", type=float, default=10)
+    parser.add_argument("--detector", default="haar", help="face detector backend (haar or dnn)")
+    parser.add_argument("--detector-threads", type=int, help="OpenCV worker threads")
+    parser.add_argument("--no-motion-gate", action="store_true", help="run face detection on every frame")
+    parser.add_argument("--fixed-rate", action="store_true",
+                        help="always analyse at --analysis-fps instead of adapting to activity")
+    args = parser.parse_args(argv)
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    camera = cv2.VideoCapture(source)
+    if not camera.isOpened():
+        raise SystemExit(f"Cannot open video source: {args.source}")
+
+    memory = MemorySink()
+    sinks = [memory, CallbackSink(print_event)]
+    if args.log_file:
+        sinks.append(FileSink(args.log_file))
+    journal = None
+    if args.journal:
+        from journal import SessionJournal
+        journal = SessionJournal.new_session()
+        memory.store.subscribe(journal.record)
+
+    proctor = GoogolCheatingDetectorAI(sinks=sinks, camera=camera, analysis_fps=args.analysis_fps,
+                                       monitor_inputs=not args.no_inputs, adaptive_rate=not args.fixed_rate,
+                                       motion_gate=not args.no_motion_gate, detector=args.detector,
+                                       detector_threads=args.detector_threads, evidence_dir=args.evidence_dir,
+                                       file_source=not isinstance(source, int))
+    server = MetricsServer(registry, port=args.metrics_port).start() if args.metrics_port else None
+    profile = None
+    if args.profile:
+        profile = ProfileSession(profile_directory(args.profile_dir), duration=args.profile,
+                                 on_done=lambda p: print(f"Profile saved to {p.directory}")).start()
+    if args.duration:
+        timer = Thread(target=lambda: (time.sleep(args.duration), proctor.stop()), daemon=True)
+        timer.start()
+    try:
+        proctor.monitor_environment()
+    except KeyboardInterrupt:
+        pass  # monitor_environment() has already stopped and drained the pipeline
+    finally:
+        with proctor.cam_lock:
+            camera.release()
+        for sink in sinks:
+            sink.close()
+        if journal:
+            journal.close()
+        if server:
+            server.stop()
+        if profile and profile.running:
+            profile.stop()
+            profile.join()
+    print(f"{len(memory.store)} events, {memory.store.alert_count} alerts; {proctor.stats()}")
+
+
+if __name__ == "__main__":
+    main()
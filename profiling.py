@@ -0,0 +1,192 @@
+"""On-demand CPU and memory profiling of a running session
+
+ProfileSession samples the Python stacks of every thread (monitor stages,
+input listeners, the Tk main loop) for a fixed time, and optionally diffs
+tracemalloc snapshots taken before, during and after that window. Nothing
+is installed until a session starts, so normal runs pay no overhead. Results
+are plain text in their own directory:
+
+    cpu_folded.txt   one "thread;outer;...;inner count" line per stack,
+                     ready for flamegraph.pl or speedscope
+    cpu_top.txt      functions by self and total samples, per thread
+    memory_diff.txt  allocation sites that grew, per snapshot interval
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class StackSampler:
+    """Counts the call stacks of all other threads every `interval` seconds"""
+
+    def __init__(self, interval=0.01, max_depth=64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self.sample_time = 0.0
+
+    def sample(self, skip=None):
+        start = time.perf_counter()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == skip:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[tuple(reversed(stack))] += 1
+        self.samples += 1
+        self.sample_time += time.perf_counter() - start
+
+    def run(self, until, stop):
+        me = threading.get_ident()
+        while time.perf_counter() < until and not stop.is_set():
+            self.sample(skip=me)
+            stop.wait(self.interval)
+
+    def folded(self):
+        return [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+
+    def top(self, limit=40):
+        """Per-thread tables of the functions with the most self and total samples"""
+        by_thread = {}
+        for stack, count in self.stacks.items():
+            thread, frames = stack[0], stack[1:]
+            own, total, samples = by_thread.setdefault(thread, (Counter(), Counter(), [0]))
+            samples[0] += count
+            if frames:
+                own[frames[-1]] += count
+            for label in set(frames):
+                total[label] += count
+
+        lines = [f"{self.samples} samples every {self.interval * 1000:g} ms "
+                 f"(sampler overhead {self.sample_time * 1000:.0f} ms)", ""]
+        for thread, (own, total, samples) in sorted(by_thread.items(), key=lambda t: -t[1][2][0]):
+            lines.append(f"== {thread} ({samples[0]} samples)")
+            lines.append(f"{'self':>7} {'total':>7}  function")
+            for label, count in own.most_common(limit):
+                lines.append(f"{count / samples[0]:7.1%} {total[label] / samples[0]:7.1%}  {label}")
+            lines.append("")
+        return lines
+
+
+class ProfileSession:
+    """Profiles the whole process for `duration` seconds on a background thread
+
+    With `memory`, tracemalloc runs for the same window (it slows allocations
+    down noticeably, hence only on demand) and a snapshot every
+    `snapshot_interval` seconds is compared with the previous one and with
+    the first.
+    """
+
+    def __init__(self, directory, duration=30.0, interval=0.01, memory=True, snapshot_interval=10.0,
+                 frames=8, on_done=None):
+        self.directory = directory
+        self.duration = duration
+        self.memory = memory
+        self.snapshot_interval = snapshot_interval
+        self.frames = frames
+        self.on_done = on_done
+        self.sampler = StackSampler(interval)
+        self._stop = threading.Event()
+        self._thread = None
+        self.error = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """End early; results are still written"""
+        self._stop.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        started_tracing = False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            snapshots = []
+            if self.memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(self.frames)
+                    started_tracing = True
+                snapshots.append((0.0, tracemalloc.take_snapshot()))
+
+            start = time.perf_counter()
+            end = start + self.duration
+            while time.perf_counter() < end and not self._stop.is_set():
+                step_end = min(end, time.perf_counter() + self.snapshot_interval) if self.memory else end
+                self.sampler.run(step_end, self._stop)
+                if self.memory:
+                    snapshots.append((time.perf_counter() - start, tracemalloc.take_snapshot()))
+
+            self._write("cpu_folded.txt", self.sampler.folded())
+            self._write("cpu_top.txt", self.sampler.top())
+            if self.memory:
+                self._write("memory_diff.txt", self.memory_report(snapshots))
+        except Exception as e:
+            self.error = e
+            print(f"Profiling failed: {str(e)}")
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+        if self.on_done:
+            self.on_done(self)
+
+    @staticmethod
+    def memory_report(snapshots, limit=25):
+        lines = []
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        snapshots = [(at, snapshot.filter_traces(ignore)) for at, snapshot in snapshots]
+
+        def section(title, newer, older):
+            lines.append(f"== {title}")
+            for stat in newer.compare_to(older, "traceback")[:limit]:
+                if stat.size_diff <= 0:
+                    continue
+                frame = stat.traceback[-1] if stat.traceback else None
+                where = f"{frame.filename}:{frame.lineno}" if frame else "?"
+                lines.append(f"{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks  {where}")
+                for caller in list(stat.traceback)[-2::-1][:3]:
+                    lines.append(f"{'':32}from {caller.filename}:{caller.lineno}")
+            lines.append("")
+
+        if len(snapshots) < 2:
+            return ["Not enough snapshots"]
+        first_at, first = snapshots[0]
+        last_at, last = snapshots[-1]
+        section(f"Growth over the whole window ({last_at - first_at:.0f}s)", last, first)
+        for (older_at, older), (newer_at, newer) in zip(snapshots, snapshots[1:]):
+            section(f"Growth {older_at:.0f}s -> {newer_at:.0f}s", newer, older)
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        if peak:
+            lines.append(f"Traced memory now {current / 1024 / 1024:.1f} MiB, peak {peak / 1024 / 1024:.1f} MiB")
+        return lines
+
+    def _write(self, name, lines):
+        with open(os.path.join(self.directory, name), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def profile_directory(root):
+    """A fresh timestamped directory under `root` for one profiling run"""
+    return os.path.join(root, time.strftime("profile_%Y%m%d_%H%M%S"))
@@ -0,0 +1,296 @@
+"""Exam report PDFs rendered with fpdf2 on a worker thread
+
+ReportJob lays out the summary text, per-minute event charts and the
+event table straight from an EventStore, so the Tk thread only reads
+`progress` and `pages` on a timer, like SummaryJob. fpdf2 keeps every page
+in memory until output(), so the table is capped at `max_rows` rows (runs
+of identical events count as one); the charts always cover the whole
+session and the complete log stays in the session journal.
+"""
+import os
+import textwrap
+import time
+from threading import Thread, Event
+
+import numpy as np
+from fpdf import FPDF
+
+from events import SEVERITIES, INFO, WARNING, ALERT, CRITICAL
+
+# Chart and table colours per severity, readable on white paper
+SEVERITY_RGB = {INFO: (150, 150, 150), WARNING: (240, 165, 0),
+                ALERT: (230, 100, 0), CRITICAL: (215, 25, 25)}
+
+
+def pdf_text(text):
+    """Core PDF fonts only cover Latin-1; anything else becomes '?'"""
+    return text.replace("•", "-").encode("latin-1", errors="replace").decode("latin-1")
+
+
+def minute_counts(events, stop, chunk=65536):
+    """Per-minute event counts by severity for events [0, stop) as (origin, counts[minute, severity])
+
+    Columns are copied in bounded chunks (never exported as live buffers,
+    which would stop the store from growing) and binned with one bincount
+    per chunk.
+    """
+    if not stop:
+        return 0.0, np.zeros((0, len(SEVERITIES)), dtype=np.int64)
+    first, last = events.timestamps[0], events.timestamps[stop - 1]
+    origin = first - first % 60
+    minutes = int((last - origin) // 60) + 1
+    levels = len(SEVERITIES)
+    counts = np.zeros(minutes * levels, dtype=np.int64)
+    for start in range(0, stop, chunk):
+        end = min(stop, start + chunk)
+        times = np.frombuffer(events.timestamps[start:end], dtype=np.float64)
+        severities = np.frombuffer(events.severities[start:end], dtype=np.uint8)
+        slots = ((times - origin) // 60).astype(np.intp)
+        np.clip(slots, 0, minutes - 1, out=slots)
+        counts += np.bincount(slots * levels + severities, minlength=minutes * levels)
+    return origin, counts.reshape(minutes, levels)
+
+
+class ReportPDF(FPDF):
+    """FPDF with a page-number footer and an optional header repeated on every new page"""
+
+    def __init__(self, title, on_page=None):
+        super().__init__(format="A4")
+        self.report_title = title
+        self.on_page = on_page
+        self.repeat_header = None
+        self.set_auto_page_break(True, margin=15)
+
+    def header(self):
+        if self.on_page and self.page_no() > 1:
+            self.on_page(self.page_no() - 1)
+        if self.repeat_header:
+            self.repeat_header()
+
+    def footer(self):
+        self.set_y(-12)
+        self.set_font("Helvetica", size=8)
+        self.set_text_color(110, 110, 110)
+        self.cell(0, 5, pdf_text(f"{self.report_title}   Page {self.page_no()}"))
+
+
+class ReportJob:
+    """Renders one report PDF on a worker thread
+
+    The event table collapses consecutive identical events into one row with
+    a count; the charts show events per minute stacked by severity,
+    `chart_minutes` minutes per chart. Events logged after start() are not
+    included.
+    """
+
+    RUNNING, DONE, CANCELLED, ERROR = "running", "done", "cancelled", "error"
+
+    def __init__(self, path, events, summary="", details=(), title="Exam Integrity Report",
+                 chart_minutes=60, max_rows=20000, table_size=7.5):
+        self.path = path
+        self.events = events
+        self.summary = summary
+        self.details = list(details)
+        self.title = title
+        self.chart_minutes = chart_minutes
+        self.max_rows = max_rows
+        self.table_size = table_size
+        self.state = self.RUNNING
+        self.error = None
+        self.progress = 0.0
+        self.pages = 0
+        self.rows = 0
+        self.omitted_rows = 0
+        self.started = None
+        self.elapsed = None
+        self._cancel = Event()
+        self._thread = Thread(target=self._run, name="report", daemon=True)
+
+    @property
+    def running(self):
+        return self.state == self.RUNNING
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self.state
+
+    def _page_done(self, pages):
+        self.pages = pages
+        if self._cancel.is_set():
+            raise InterruptedError
+
+    def _run(self):
+        try:
+            stop = len(self.events)
+            pdf = ReportPDF(self.title, on_page=self._page_done)
+            pdf.add_page()
+            self.write_header(pdf, stop)
+            self.write_summary(pdf)
+            self.progress = 0.05
+            self.write_charts(pdf, stop)
+            self.progress = 0.1
+            self.write_table(pdf, stop)
+            if self._cancel.is_set():
+                raise InterruptedError
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            pdf.output(self.path)
+            self.pages = pdf.page_no()
+            self.progress = 1.0
+            self.state = self.DONE
+        except InterruptedError:
+            self.state = self.CANCELLED
+        except Exception as e:
+            self.error = e
+            self.state = self.ERROR
+        self.elapsed = time.perf_counter() - self.started
+
+    def write_header(self, pdf, stop):
+        pdf.set_font("Helvetica", "B", 16)
+        pdf.cell(0, 10, pdf_text(self.title), align="C", new_x="LMARGIN", new_y="NEXT")
+        pdf.set_font("Helvetica", size=12)
+        for line in self.details + [f"Logged Events: {stop}"]:
+            pdf.multi_cell(0, 8, pdf_text(line), new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(6)
+
+    def write_summary(self, pdf):
+        for line in self.summary.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("**") and line.endswith("**"):
+                pdf.set_font("Helvetica", "B", 14)
+                pdf.cell(0, 10, pdf_text(line[2:-2]), new_x="LMARGIN", new_y="NEXT")
+            else:
+                pdf.set_font("Helvetica", size=12)
+                pdf.multi_cell(0, 8, pdf_text(line.replace("**", "")), new_x="LMARGIN", new_y="NEXT")
+
+    def section(self, pdf, title):
+        pdf.ln(4)
+        if pdf.get_y() > pdf.h - 50:
+            pdf.add_page()
+        pdf.set_font("Helvetica", "B", 13)
+        pdf.set_text_color(0, 0, 0)
+        pdf.cell(0, 9, title, new_x="LMARGIN", new_y="NEXT")
+
+    def write_charts(self, pdf, stop):
+        origin, counts = minute_counts(self.events, stop)
+        if not len(counts):
+            return
+        self.section(pdf, "Events per minute")
+        pdf.set_font("Helvetica", size=8)
+        x = pdf.l_margin
+        for level in range(len(SEVERITIES)):
+            pdf.set_fill_color(*SEVERITY_RGB[level])
+            pdf.rect(x, pdf.get_y() + 1, 3, 3, style="F")
+            pdf.set_xy(x + 4, pdf.get_y())
+            pdf.cell(20, 5, SEVERITIES[level])
+            x += 25
+        pdf.ln(8)
+
+        # Bar tops come from cumulative sums, one row per minute, in one NumPy pass
+        peak = max(int(counts.sum(axis=1).max()), 1)
+        chart_height = 40.0
+        tops = np.cumsum(counts, axis=1) / peak * chart_height
+        heights = counts / peak * chart_height
+        label_width = 10.0
+        left = pdf.l_margin + label_width
+        slot = (pdf.epw - label_width) / self.chart_minutes
+        pdf.set_font("Helvetica", size=7)
+        for first in range(0, len(counts), self.chart_minutes):
+            last = min(first + self.chart_minutes, len(counts))
+            if pdf.get_y() + chart_height + 12 > pdf.h - pdf.b_margin:
+                pdf.add_page()
+            top = pdf.get_y()
+            base = top + chart_height
+            pdf.set_text_color(80, 80, 80)
+            pdf.text(pdf.l_margin, top + 2, str(peak))
+            pdf.text(pdf.l_margin, base, "0")
+            pdf.set_draw_color(80, 80, 80)
+            pdf.line(left, base, left + self.chart_minutes * slot, base)
+            for minute in range(first, last):
+                bar_x = left + (minute - first) * slot + slot * 0.1
+                for level in np.flatnonzero(counts[minute]):
+                    pdf.set_fill_color(*SEVERITY_RGB[level])
+                    pdf.rect(bar_x, base - tops[minute, level], slot * 0.8, heights[minute, level], style="F")
+            pdf.text(left, base + 4, time.strftime("%H:%M", time.localtime(origin + first * 60)))
+            end_label = time.strftime("%H:%M", time.localtime(origin + last * 60))
+            pdf.text(left + (last - first) * slot - pdf.get_string_width(end_label), base + 4, end_label)
+            pdf.set_y(base + 8)
+
+    def write_table(self, pdf, stop):
+        size = self.table_size
+        row_height = size * 0.48
+        pdf.set_font("Courier", size=size)
+        # Courier is fixed-pitch, so columns and wrapping are counted in characters
+        chars = int(pdf.epw / pdf.get_string_width("M"))
+        columns = (("Time", 10), ("Severity", 10), ("Type", 16), ("Count", 7))
+        prefix = sum(width for _, width in columns)
+        message_chars = max(20, chars - prefix)
+        heading = "".join(name.ljust(width) for name, width in columns) + "Message"
+
+        def header():
+            pdf.set_font("Courier", "B", size)
+            pdf.set_text_color(70, 70, 70)
+            pdf.cell(0, row_height + 1, heading, border="B", new_x="LMARGIN", new_y="NEXT")
+            pdf.set_font("Courier", size=size)
+
+        self.section(pdf, "Event log")
+        header()
+        pdf.repeat_header = header
+
+        def emit(first, count):
+            lines = textwrap.wrap(first.message, message_chars) or [""]
+            when = first.time_text if count == 1 else f"{first.time_text}+"
+            cells = (when, first.severity_name, first.event_type[:columns[2][1] - 1],
+                     f"x{count}" if count > 1 else "")
+            pdf.set_text_color(*(SEVERITY_RGB[first.severity] if first.severity >= ALERT else (0, 0, 0)))
+            # Lines are already wrapped, so plain cells avoid multi_cell's far slower line breaking
+            text = "".join(cell.ljust(width) for cell, (_, width) in zip(cells, columns)) + lines[0]
+            pdf.cell(0, row_height, pdf_text(text), new_x="LMARGIN", new_y="NEXT")
+            for line in lines[1:]:
+                pdf.cell(0, row_height, pdf_text(" " * prefix + line), new_x="LMARGIN", new_y="NEXT")
+            self.rows += 1
+
+        run = None
+        for event in self.events.records(0, stop):
+            if run and (event.event_type, event.message) == (run[0].event_type, run[0].message):
+                run[1] += 1
+                continue
+            if run:
+                if self.rows < self.max_rows:
+                    emit(*run)
+                    self.progress = 0.1 + 0.85 * max(event.index / stop, self.rows / self.max_rows)
+                else:
+                    self.omitted_rows += 1
+                if self._cancel.is_set():
+                    raise InterruptedError
+            run = [event, 1]
+        if run:
+            if self.rows < self.max_rows:
+                emit(*run)
+            else:
+                self.omitted_rows += 1
+        pdf.repeat_header = None
+        if self.omitted_rows:
+            pdf.ln(3)
+            pdf.set_font("Helvetica", "I", 10)
+            pdf.set_text_color(0, 0, 0)
+            pdf.multi_cell(0, 6, f"{self.omitted_rows} later rows are not included in this report; "
+                                 f"the complete log is kept in the session journal.",
+                           new_x="LMARGIN", new_y="NEXT")
+        self.progress = 0.95
+
+    def stats(self):
+        return {"pages": self.pages, "rows": self.rows, "omitted_rows": self.omitted_rows,
+                "seconds": self.elapsed or 0.0,
+                "bytes": os.path.getsize(self.path) if self.state == self.DONE else 0}
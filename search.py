@@ -0,0 +1,216 @@
+"""Indexed filtering and full-text search over an EventStore
+
+EventIndex keeps NumPy copies of the store's columns, extended
+incrementally before each query, plus an inverted index from lower-cased
+words to interned string ids. Because messages are interned, the word
+index only grows with distinct messages, not with events. A query turns
+every condition into a boolean lookup table over string ids, severities
+or types and applies it to a whole column at once. While timestamps are
+in order, time ranges are binary-searched first, so only that slice gets
+scanned.
+"""
+import re
+import time
+from datetime import datetime
+
+import numpy as np
+
+WORD = re.compile(r"\w+")
+
+
+def words(text):
+    return WORD.findall(text.lower())
+
+
+def clock_time(text, reference, end=False):
+    """Timestamp of "HH:MM" or "HH:MM:SS" on the local date of `reference`; None if blank
+
+    With `end`, the time covers the whole minute (or second) given, so
+    "10:20" as an upper bound includes 10:20:59. Raises ValueError on
+    anything else.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    parts = [int(part) for part in text.split(":")]
+    if not 2 <= len(parts) <= 3:
+        raise ValueError(f"Expected HH:MM or HH:MM:SS, got {text!r}")
+    hour, minute, second = parts + [0] * (3 - len(parts))
+    day = datetime.fromtimestamp(reference)
+    timestamp = day.replace(hour=hour, minute=minute, second=second, microsecond=0).timestamp()
+    if end:
+        timestamp += 60 if len(parts) == 2 else 1
+    return timestamp
+
+
+class EventView:
+    """The events at `indices` of `store`, as a read-only source for VirtualLogList"""
+
+    def __init__(self, store, indices):
+        self.store = store
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, position):
+        return self.store[int(self.indices[position])]
+
+
+class EventIndex:
+    """Answers filtered and word queries over an EventStore in milliseconds
+
+    The index is brought up to date on every query (or by calling update()),
+    so it needs no hook into EventStore.append() and costs the logging
+    threads nothing.
+    """
+
+    def __init__(self, store, capacity=4096):
+        self.store = store
+        self.count = 0
+        self.times = np.empty(capacity, dtype=np.float64)
+        self.type_ids = np.empty(capacity, dtype=np.uint32)
+        self.severities = np.empty(capacity, dtype=np.uint8)
+        self.message_ids = np.empty(capacity, dtype=np.uint32)
+        # True while timestamps never went backwards, which allows binary search
+        self.ordered = True
+        self.postings = {}
+        self.strings_indexed = 0
+        self.types_seen = set()
+        self.update_seconds = 0.0
+
+    def _reserve(self, size):
+        capacity = len(self.times)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("times", "type_ids", "severities", "message_ids"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def update(self):
+        """Index events and strings logged since the last call; returns the number of new events"""
+        start = time.perf_counter()
+        timestamps, type_ids, severities, message_ids = self.store.columns(self.count)
+        added = len(timestamps)
+        if added:
+            end = self.count + added
+            self._reserve(end)
+            times = np.frombuffer(timestamps, dtype=np.float64)
+            if self.ordered:
+                self.ordered = bool((self.count == 0 or times[0] >= self.times[self.count - 1])
+                                    and np.all(times[1:] >= times[:-1]))
+            self.times[self.count:end] = times
+            # Type ids share the string-id space, so they are as wide as the store keeps them
+            self.type_ids[self.count:end] = np.frombuffer(type_ids, dtype=np.dtype(type_ids.typecode))
+            self.severities[self.count:end] = np.frombuffer(severities, dtype=np.uint8)
+            self.message_ids[self.count:end] = np.frombuffer(message_ids, dtype=np.uint32)
+            self.types_seen.update(np.unique(self.type_ids[self.count:end]).tolist())
+            self.count = end
+
+        # Fetched after the columns, so every id they reference is covered
+        strings = self.store.strings(self.strings_indexed)
+        for string_id, text in enumerate(strings, self.strings_indexed):
+            for word in set(words(text)):
+                self.postings.setdefault(word, []).append(string_id)
+        self.strings_indexed += len(strings)
+        self.update_seconds += time.perf_counter() - start
+        return added
+
+    def event_types(self):
+        return sorted(self.store.string(type_id) for type_id in self.types_seen)
+
+    def _word_table(self, word, prefix):
+        """Boolean table over string ids: which strings contain `word`"""
+        table = np.zeros(self.strings_indexed, dtype=bool)
+        if prefix:
+            for key, ids in self.postings.items():
+                if key.startswith(word):
+                    table[ids] = True
+        else:
+            ids = self.postings.get(word)
+            if ids:
+                table[ids] = True
+        return table
+
+    def query(self, text="", since=None, until=None, event_types=None, severities=None):
+        """Indices of the matching events, oldest first, as a NumPy array
+
+        Every given condition must hold: since <= timestamp < until, the
+        event type is one of `event_types`, the severity level is one of
+        `severities`, and each word of `text` appears in the message or the
+        event type. Unless `text` ends with a space, its last word also
+        matches as a prefix, for search-as-you-type.
+        """
+        self.update()
+        lo, hi = 0, self.count
+        mask = None
+        if self.ordered:
+            if since is not None:
+                lo = int(np.searchsorted(self.times[:hi], since, side="left"))
+            if until is not None:
+                hi = int(np.searchsorted(self.times[:hi], until, side="left"))
+            if hi <= lo:
+                return np.empty(0, dtype=np.intp)
+        elif since is not None or until is not None:
+            times = self.times[:hi]
+            mask = np.ones(hi, dtype=bool)
+            if since is not None:
+                mask &= times >= since
+            if until is not None:
+                mask &= times < until
+
+        type_ids = self.type_ids[lo:hi]
+        if event_types is not None:
+            table = np.zeros(self.strings_indexed, dtype=bool)
+            for event_type in event_types:
+                type_id = self.store.string_id(event_type)
+                # Strings interned after update() cannot occur in the indexed rows
+                if type_id is not None and type_id < len(table):
+                    table[type_id] = True
+            mask = table[type_ids] if mask is None else mask & table[type_ids]
+        if severities is not None:
+            table = np.zeros(256, dtype=bool)
+            table[list(severities)] = True
+            selected = table[self.severities[lo:hi]]
+            mask = selected if mask is None else mask & selected
+
+        query_words = words(text)
+        if query_words:
+            # Words that no event type contains are combined per string first,
+            # so the message column is looked up once however many words there are
+            message_ids = self.message_ids[lo:hi]
+            types = list(self.types_seen)
+            combined = None
+            for position, word in enumerate(query_words):
+                prefix = position == len(query_words) - 1 and not text.endswith(" ")
+                table = self._word_table(word, prefix)
+                if table[types].any():
+                    found = table[message_ids] | table[type_ids]
+                    mask = found if mask is None else mask & found
+                else:
+                    combined = table if combined is None else combined & table
+            if combined is not None:
+                found = combined[message_ids]
+                mask = found if mask is None else mask & found
+
+        if mask is None:
+            return np.arange(lo, hi, dtype=np.intp)
+        indices = np.flatnonzero(mask)
+        if lo:
+            indices += lo
+        return indices
+
+    def stats(self):
+        return {
+            "indexed_events": self.count,
+            "indexed_strings": self.strings_indexed,
+            "words": len(self.postings),
+            "ordered": self.ordered,
+            "update_seconds": self.update_seconds,
+            "index_bytes": sum(column.nbytes for column in
+                               (self.times, self.type_ids, self.severities, self.message_ids)),
+        }
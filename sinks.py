@@ -0,0 +1,74 @@
+import time
+from threading import Lock
+
+from events import EventStore
+
+
+class Sink:
+    """Destination for what the detector produces
+
+    Sinks receive every event through log_event(); only sinks that set
+    `wants_frames` get annotated frames through update_frame(). When no sink
+    wants frames the detector skips its render stage entirely. The Tk app
+    satisfies the same interface, so it is just one more sink.
+    update_status() receives a short periodic status line such as the
+    effective analysis rate.
+    """
+
+    wants_frames = False
+
+    def log_event(self, event_type, message):
+        pass
+
+    def update_frame(self, frame):
+        pass
+
+    def update_status(self, text):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemorySink(Sink):
+    """Keeps events in an EventStore (a new one unless one is passed in)"""
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else EventStore()
+
+    def log_event(self, event_type, message):
+        self.store.append(event_type, message)
+
+
+class FileSink(Sink):
+    """Appends one human-readable line per event to a text file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = Lock()
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+
+    def log_event(self, event_type, message):
+        line = f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {event_type}: {message}\n"
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class CallbackSink(Sink):
+    """Forwards events (and frames, if `on_frame` is given) to plain callables"""
+
+    def __init__(self, on_event, on_frame=None):
+        self.on_event = on_event
+        self.on_frame = on_frame
+        self.wants_frames = on_frame is not None
+
+    def log_event(self, event_type, message):
+        self.on_event(event_type, message)
+
+    def update_frame(self, frame):
+        self.on_frame(frame)
@@ -0,0 +1,238 @@
+import time
+from collections import deque
+from threading import Thread, Event, Lock
+
+
+class SummaryJob:
+    """Runs one Gemini summary request on a worker thread and streams its text
+
+    The worker only appends chunks to a deque; the Tk thread calls poll()
+    on a timer to pick them up, so no widget is ever touched off the UI
+    thread. cancel() stops consuming the stream at the next chunk and
+    timeouts are enforced from poll(), so a request that hangs before its
+    first chunk is abandoned too (the daemon worker simply finishes later
+    and its output is ignored).
+    """
+
+    RUNNING, DONE, CANCELLED, TIMEOUT, ERROR = "running", "done", "cancelled", "timeout", "error"
+
+    def __init__(self, model, prompt, timeout=90):
+        self.model = model
+        self.prompt = prompt
+        self.timeout = timeout
+        self.state = self.RUNNING
+        self.error = None
+        self.text = ""
+        self.started = None
+        self.first_chunk_after = None
+        self.watermark = None
+        self._chunks = deque()
+        self._cancel = Event()
+        self._lock = Lock()
+        self._thread = Thread(target=self._run, name="summary", daemon=True)
+
+    @classmethod
+    def completed(cls, text):
+        """A finished job holding `text`, for re-showing a report without a request"""
+        job = cls(None, None)
+        job.state = cls.DONE
+        job.text = text
+        job._chunks.append(text)
+        return job
+
+    @property
+    def running(self):
+        return self.state == self.RUNNING
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+        self._finish(self.CANCELLED)
+
+    def poll(self):
+        """Return the text received since the last poll (Tk thread)"""
+        if self.running and self.timeout and time.perf_counter() - self.started > self.timeout:
+            self._cancel.set()
+            self._finish(self.TIMEOUT, TimeoutError(f"No complete summary after {self.timeout}s"))
+        new = []
+        while self._chunks:
+            new.append(self._chunks.popleft())
+        return "".join(new)
+
+    def wait(self, timeout=None):
+        """Block until the worker returns; for headless callers and tests"""
+        self._thread.join(timeout)
+        return self.poll()
+
+    def _finish(self, state, error=None):
+        with self._lock:
+            if self.state != self.RUNNING:
+                return False
+            self.state = state
+            self.error = error
+            return True
+
+    def _run(self):
+        try:
+            kwargs = {"stream": True}
+            if self.timeout:
+                kwargs["request_options"] = {"timeout": self.timeout}
+            response = self.model.generate_content(self.prompt, **kwargs)
+            for chunk in response:
+                if self._cancel.is_set():
+                    return
+                text = chunk.text
+                if not text:
+                    continue
+                if self.first_chunk_after is None:
+                    self.first_chunk_after = time.perf_counter() - self.started
+                with self._lock:
+                    if self.state != self.RUNNING:
+                        return
+                    self.text += text
+                    self._chunks.append(text)
+            self._finish(self.DONE)
+        except Exception as e:
+            self._finish(self.ERROR, e)
+
+
+class FakeSummaryModel:
+    """Local stand-in for genai.GenerativeModel with the same streaming shape
+
+    Yields `text` in `chunk_size` pieces, sleeping `delay` seconds before
+    each one, so summary handling can be exercised without network access.
+    """
+
+    class Chunk:
+        def __init__(self, text):
+            self.text = text
+
+    def __init__(self, text="**Exam Integrity Report**\n- No issues found", chunk_size=40,
+                 delay=0.05, fail_with=None):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.delay = delay
+        self.fail_with = fail_with
+        self.prompts = []
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        self.prompts.append(prompt)
+        if not stream:
+            time.sleep(self.delay)
+            return self.Chunk(self.text)
+        return self._stream()
+
+    def _stream(self):
+        for start in range(0, len(self.text), self.chunk_size):
+            time.sleep(self.delay)
+            if self.fail_with is not None:
+                raise self.fail_with
+            yield self.Chunk(self.text[start:start + self.chunk_size])
+
+
+REPORT_FORMAT = """
+**Exam Integrity Report**
+- Date: {date}
+- Total Alerts: {alerts}
+
+**Key Findings**
+[Bullet points of important findings]
+
+**Suspicious Activity Timeline**
+[List most important events in chronological order]
+
+**Final Assessment**
+[Overall assessment of test integrity]
+"""
+
+
+class IncrementalSummarizer:
+    """Builds summary prompts that only carry the events since the last report
+
+    The first request summarizes everything logged so far. After a report
+    completes, its text and a watermark (the index of the first event it did
+    not see) are kept; later requests send the prior report plus only the
+    newer events and ask the model to fold them in. Long deltas are
+    compressed by collapsing runs of identical events and capped at
+    `max_lines`, so each request costs roughly the same however long the
+    exam has been running, while the report still covers the whole session.
+    """
+
+    def __init__(self, events, max_lines=150):
+        self.events = events
+        self.max_lines = max_lines
+        self.watermark = 0
+        self.summary = None
+
+    @property
+    def pending(self):
+        return len(self.events) - self.watermark
+
+    def delta_lines(self, start, stop):
+        """Collapse consecutive identical events into one line with a count"""
+        runs = []
+        for event in self.events.records(start, stop):
+            if runs and (event.event_type, event.message) == (runs[-1][0].event_type, runs[-1][0].message):
+                runs[-1][1] = event
+                runs[-1][2] += 1
+            else:
+                runs.append([event, event, 1])
+
+        lines = []
+        if len(runs) > self.max_lines:
+            omitted = {}
+            for first, _, count in runs[:-self.max_lines]:
+                omitted[first.event_type] = omitted.get(first.event_type, 0) + count
+            counts = ", ".join(f"{event_type} x{count}" for event_type, count in omitted.items())
+            lines.append(f"[Earlier entries condensed: {counts}]")
+            runs = runs[-self.max_lines:]
+        lines.extend(self._run_line(first, last, count) for first, last, count in runs)
+        return lines
+
+    @staticmethod
+    def _run_line(first, last, count):
+        if count == 1:
+            return str(first)
+        return f"{first.time_text}-{last.time_text} - {first.event_type}: {first.message} (x{count})"
+
+    def build_prompt(self, date, alerts, attention=None):
+        """Return (prompt, watermark) for the events not covered by the last report
+
+        `attention` is an optional one-line description of the session's
+        attention metrics (AttentionWindow.describe()), added as context.
+        """
+        stop = len(self.events)
+        logs = "\n".join(self.delta_lines(self.watermark, stop))
+        if attention:
+            logs = f"[Attention metrics for the whole session: {attention}]\n{logs}"
+        report_format = REPORT_FORMAT.format(date=date, alerts=alerts)
+        if self.summary is None:
+            prompt = (
+                "Analyze these cheating detection logs from an exam proctoring system and create "
+                "a comprehensive summary report.\n"
+                "Focus on identifying patterns, suspicious activities, and overall test integrity.\n"
+                "Provide the summary in this format:\n"
+                f"{report_format}\n"
+                f"Logs to analyze:\n{logs}\n"
+            )
+        else:
+            prompt = (
+                "You previously wrote the exam integrity report below for an exam proctoring "
+                "system. New log entries have been recorded since then.\n"
+                "Update the report so it covers the whole session: keep earlier findings that "
+                "still hold, add the new activity, and revise the assessment if needed.\n"
+                "Reply with the complete updated report in this format:\n"
+                f"{report_format}\n"
+                f"Previous report:\n{self.summary}\n\n"
+                f"New logs since the previous report:\n{logs}\n"
+            )
+        return prompt, stop
+
+    def commit(self, summary, watermark):
+        """Record a completed report so the next request starts after it"""
+        self.summary = summary
+        self.watermark = watermark
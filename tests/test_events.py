@@ -0,0 +1,71 @@
+from threading import Thread
+
+from events import EventStore, INFO, WARNING, ALERT, CRITICAL, classify
+
+
+def test_append_returns_indices_and_classifies():
+    store = EventStore()
+    assert store.append("INFO", "Monitoring started", timestamp=1.0) == 0
+    assert store.append("CHEAT DETECTED", "Phone visible", timestamp=2.0) == 1
+    assert store.append("AI ALERT", "AI MODEL flagged the session", timestamp=3.0) == 2
+    assert [event.severity for event in store.records()] == [INFO, ALERT, CRITICAL]
+    assert store.alert_count == 2
+    assert classify("WARNING", "Face not centered") == WARNING
+
+
+def test_strings_are_interned_once():
+    store = EventStore()
+    for n in range(50):
+        store.append("WARNING", "Face not centered", timestamp=float(n))
+    assert store.strings() == ["WARNING", "Face not centered"]
+    assert store.string_id("Face not centered") == 1
+    assert store.string_id("never logged") is None
+    assert set(store.type_ids) == {0} and set(store.message_ids) == {1}
+
+
+def test_indexing_and_slicing():
+    store = EventStore()
+    for n in range(10):
+        store.append("INFO", f"event {n}", timestamp=100.0 + n)
+    assert len(store) == 10
+    assert store[3].message == "event 3" and store[3].index == 3
+    assert store[-1].message == "event 9"
+    assert [event.message for event in store.records(7)] == ["event 7", "event 8", "event 9"]
+    assert [event.index for event in store.records(2, 4)] == [2, 3]
+    assert [event.index for event in store.records(8, 50)] == [8, 9]
+    assert [event.index for event in store.tail(2)] == [8, 9]
+    assert store.lines(0, 1) == [str(store[0])]
+
+    timestamps, type_ids, severities, message_ids = store.columns(6)
+    assert list(timestamps) == [106.0, 107.0, 108.0, 109.0]
+    assert len(type_ids) == len(severities) == len(message_ids) == 4
+    assert store.strings(store.string_id("event 8")) == ["event 8", "event 9"]
+
+
+def test_types_stay_loggable_after_many_distinct_messages():
+    store = EventStore()
+    for n in range(300):
+        store.append("INFO", f"Window changed to: w{n}")
+    for event_type in ("DEVIATION ENDED", "CHEAT DETECTED", "CRITICAL ALERT"):
+        index = store.append(event_type, "x")
+        assert store[index].event_type == event_type
+    assert store.string_id("CRITICAL ALERT") > 255
+    assert len(store) == 303
+
+
+def test_concurrent_appends_keep_columns_aligned():
+    store = EventStore()
+
+    def log(worker):
+        for n in range(2000):
+            store.append(f"TYPE {worker}", f"message {worker} {n % 300}")
+
+    threads = [Thread(target=log, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store) == 8000
+    for event in store.records():
+        worker = event.event_type.split()[1]
+        assert event.message.split()[1] == worker
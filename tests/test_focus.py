@@ -0,0 +1,54 @@
+from focus import FakeBackend, WindowFocusMonitor
+
+
+def start_monitor(title="Exam"):
+    transitions = []
+    backend = FakeBackend(title)
+    monitor = WindowFocusMonitor(transitions.append, backend=backend).start()
+    return backend, monitor, transitions
+
+
+def test_starts_on_the_current_title():
+    _, monitor, transitions = start_monitor("Exam - Browser")
+    assert monitor.current == "Exam - Browser"
+    assert transitions == []
+
+
+def test_switch_reports_a_transition():
+    backend, monitor, transitions = start_monitor()
+    backend.switch("Notepad", occurred_at=100.0)
+    assert len(transitions) == 1
+    transition = transitions[0]
+    assert (transition.previous, transition.title, transition.occurred_at) == ("Exam", "Notepad", 100.0)
+    assert transition.detected_at >= transition.occurred_at
+    assert monitor.current == "Notepad"
+    assert list(monitor.transitions) == transitions
+
+
+def test_same_title_is_not_a_transition():
+    backend, monitor, transitions = start_monitor()
+    backend.switch("Exam")
+    backend.switch("Notepad")
+    backend.switch("Notepad")
+    assert [t.title for t in transitions] == ["Notepad"]
+    assert monitor.count == 1
+
+
+def test_stats_track_latency():
+    backend, monitor, _ = start_monitor()
+    backend.switch("Notepad")
+    backend.switch("Exam")
+    stats = monitor.stats()
+    assert stats["backend"] == "fake"
+    assert stats["transitions"] == 2
+    assert 0 <= stats["mean_latency_ms"] <= stats["max_latency_ms"]
+
+
+def test_history_is_bounded():
+    transitions = []
+    backend = FakeBackend()
+    monitor = WindowFocusMonitor(transitions.append, backend=backend, history=3).start()
+    for n in range(10):
+        backend.switch(f"Window {n}")
+    assert len(transitions) == 10
+    assert [t.title for t in monitor.transitions] == ["Window 7", "Window 8", "Window 9"]
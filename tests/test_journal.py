@@ -0,0 +1,107 @@
+import json
+import os
+import time
+
+from events import EventStore, ALERT
+from journal import SessionJournal
+
+
+def write_session(root, name, records, identity="", closed=False, **options):
+    directory = os.path.join(root, name, "journal")
+    journal = SessionJournal(directory, fsync=False, **options)
+    with open(os.path.join(directory, SessionJournal.IDENTITY_FILE), "w") as f:
+        f.write(identity)
+    for n, record in enumerate(records):
+        journal.record(n, *record)
+    if closed:
+        journal.close()
+    else:
+        journal._closed = True
+        journal._wake.set()
+        journal._thread.join()
+        journal._file.close()
+    return directory
+
+
+RECORDS = [(100.0, "INFO", 0, "Monitoring started"),
+           (101.0, "CHEAT DETECTED", ALERT, "Phone visible"),
+           (102.0, "WARNING", 1, "Face not centered")]
+
+
+def test_replay_returns_records_in_order(tmp_path):
+    directory = write_session(str(tmp_path), "s1", RECORDS)
+    assert list(SessionJournal.replay(directory)) == RECORDS
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    directory = write_session(str(tmp_path), "s1", RECORDS)
+    with open(SessionJournal.segments(directory)[-1], "ab") as f:
+        f.write(b'[103.0,"INFO",0,"half wri')
+    assert len(list(SessionJournal.replay(directory))) == 3
+
+
+def test_recover_rebuilds_store_and_alert_count(tmp_path):
+    directory = write_session(str(tmp_path), "s1", RECORDS)
+    store = EventStore()
+    assert SessionJournal.recover(directory, store) == 3
+    assert [event.message for event in store.records()] == ["Monitoring started", "Phone visible",
+                                                            "Face not centered"]
+    assert store.alert_count == 1
+
+
+def test_segments_rotate_and_replay_across_them(tmp_path):
+    records = [(float(n), "INFO", 0, f"event {n} " + "x" * 40) for n in range(200)]
+    directory = os.path.join(str(tmp_path), "journal")
+    journal = SessionJournal(directory, segment_bytes=1024, flush_interval=0.01, batch_size=10, fsync=False)
+    for n, record in enumerate(records):
+        journal.record(n, *record)
+        if n % 10 == 9:
+            time.sleep(0.005)
+    journal.close()
+    assert len(SessionJournal.segments(directory)) > 1
+    assert [tuple(record) for record in SessionJournal.replay(directory)] == records
+    assert journal.records_written == 200
+
+
+def test_reopening_appends_a_new_segment(tmp_path):
+    directory = write_session(str(tmp_path), "s1", RECORDS[:1])
+    journal = SessionJournal(directory, fsync=False)
+    journal.record(1, *RECORDS[1])
+    journal.close()
+    assert len(SessionJournal.segments(directory)) == 2
+    assert len(list(SessionJournal.replay(directory))) == 2
+
+
+def test_find_unfinished_skips_closed_sessions(tmp_path):
+    root = str(tmp_path)
+    older = write_session(root, "20260301_090000", RECORDS)
+    write_session(root, "20260301_100000", RECORDS, closed=True)
+    assert SessionJournal.find_unfinished(root) == older
+    assert SessionJournal.find_unfinished(os.path.join(root, "missing")) is None
+
+
+def test_find_unfinished_requires_the_same_identity(tmp_path):
+    root = str(tmp_path)
+    mine = write_session(root, "20260301_090000", RECORDS, identity="exam-7/alice")
+    write_session(root, "20260301_100000", RECORDS, identity="exam-7/bob")
+    assert SessionJournal.find_unfinished(root, identity="exam-7/alice") == mine
+    assert SessionJournal.find_unfinished(root, identity="exam-8/alice") is None
+    assert SessionJournal.find_unfinished(root) is None
+
+
+def test_find_unfinished_ignores_stale_journals(tmp_path):
+    root = str(tmp_path)
+    directory = write_session(root, "20260301_090000", RECORDS)
+    written = max(os.path.getmtime(path) for path in SessionJournal.segments(directory))
+    assert SessionJournal.find_unfinished(root, now=written + 60) == directory
+    assert SessionJournal.find_unfinished(root, now=written + 3600) is None
+    assert SessionJournal.find_unfinished(root, max_age=7200, now=written + 3600) == directory
+
+
+def test_new_session_records_its_identity(tmp_path):
+    journal = SessionJournal.new_session(str(tmp_path), identity="exam-7/alice", fsync=False)
+    journal.record(0, *RECORDS[0])
+    journal.close()
+    assert SessionJournal.identity(journal.directory) == "exam-7/alice"
+    with open(SessionJournal.segments(journal.directory)[0]) as f:
+        assert json.loads(f.readline()) == list(RECORDS[0])
@@ -0,0 +1,89 @@
+from keys import KeyAnalyzer, TAP_ALERT, chord_name, key_name
+
+
+def analyzer(**options):
+    alerts = []
+    return KeyAnalyzer(lambda event_type, message: alerts.append((event_type, message)), **options), alerts
+
+
+def press(analyzer, keys, at, hold=0.1):
+    """Press `keys` in order, then release them in reverse"""
+    for offset, key in enumerate(keys):
+        analyzer.process("down", key, at + offset * 0.01)
+    for key in reversed(keys):
+        analyzer.process("up", key, at + hold)
+
+
+def test_key_names_are_normalised():
+    assert key_name("ctrl_l") == "ctrl"
+    assert key_name("Alt_R") == "alt"
+    assert key_name("\x03") == "c"
+    assert key_name("V") == "v"
+    assert chord_name({"shift", "s", "win"}) == "win+shift+s"
+
+
+def test_chord_alerts():
+    keys, alerts = analyzer()
+    press(keys, ["ctrl_l", "c"], at=0)
+    press(keys, ["alt", "tab"], at=5)
+    assert alerts == [("WARNING", "Copy shortcut (Ctrl+C)"),
+                      ("AI ALERT", "Window switch shortcut (Alt+Tab)")]
+
+
+def test_keys_without_a_chord_are_quiet():
+    keys, alerts = analyzer()
+    press(keys, ["a"], at=0)
+    press(keys, ["shift", "x"], at=1)
+    assert alerts == []
+    assert keys.stats()["key_events"] == 6
+
+
+def test_copy_then_paste_is_a_sequence():
+    keys, alerts = analyzer()
+    press(keys, ["ctrl", "c"], at=0)
+    press(keys, ["ctrl", "v"], at=4)
+    assert alerts[-1] == ("AI ALERT", "Copied and pasted text (Ctrl+C then Ctrl+V)")
+
+
+def test_sequence_expires():
+    keys, alerts = analyzer()
+    press(keys, ["ctrl", "c"], at=0)
+    press(keys, ["ctrl", "v"], at=20)
+    assert [message for _, message in alerts] == ["Copy shortcut (Ctrl+C)", "Paste shortcut (Ctrl+V)"]
+
+
+def test_lone_modifier_tap():
+    keys, alerts = analyzer()
+    press(keys, ["alt"], at=0, hold=0.2)
+    assert alerts == [TAP_ALERT]
+
+
+def test_held_or_combined_modifier_is_not_a_tap():
+    keys, alerts = analyzer()
+    press(keys, ["win"], at=0, hold=3)
+    press(keys, ["alt", "f4"], at=10)
+    assert alerts == []
+
+
+def test_auto_repeat_is_ignored():
+    keys, alerts = analyzer()
+    keys.process("down", "ctrl", 0)
+    for n in range(5):
+        keys.process("down", "c", 0.1 + n * 0.03)
+    keys.process("up", "c", 0.4)
+    keys.process("up", "ctrl", 0.4)
+    assert alerts == [("WARNING", "Copy shortcut (Ctrl+C)")]
+    assert keys.stats()["suppressed"] == 0
+    assert keys.stats()["peak_keys_per_sec"] == 2
+
+
+def test_repeats_are_debounced_then_reported():
+    keys, alerts = analyzer(debounce=2.0)
+    for at in (0, 0.5, 1.0):
+        press(keys, ["ctrl", "c"], at=at)
+    assert alerts == [("WARNING", "Copy shortcut (Ctrl+C)")]
+    keys.tick(1.5)
+    assert len(alerts) == 1
+    keys.tick(2.5)
+    assert alerts[-1] == ("WARNING", "Copy shortcut (Ctrl+C) (repeated 2x)")
+    assert keys.stats()["suppressed"] == 2
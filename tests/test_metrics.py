@@ -0,0 +1,46 @@
+from metrics import MetricsRegistry, timed
+
+
+class Owner:
+    def __init__(self, registry, gauge):
+        self.gauge = gauge
+        self.calls = 0
+        registry.collect_with(self.export)
+
+    def export(self):
+        self.calls += 1
+        self.gauge.set(self.calls)
+
+
+def test_callbacks_are_registered_once_and_can_be_removed():
+    registry = MetricsRegistry()
+    owner = Owner(registry, registry.gauge("test_calls", "Callback runs"))
+    registry.collect_with(owner.export)
+    registry.collect()
+    assert owner.calls == 1
+    registry.stop_collecting(owner.export)
+    registry.stop_collecting(owner.export)
+    registry.collect()
+    assert owner.calls == 1 and registry.callbacks == []
+
+
+def test_timed_observes_into_a_histogram():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "Test timings")
+    for _ in range(3):
+        with timed(histogram):
+            pass
+    assert histogram.labels().count == 3
+    assert 'test_seconds_count 3' in registry.render()
+
+
+def test_counters_render_per_label():
+    registry = MetricsRegistry()
+    events = registry.counter("test_events_total", "Events", labels=("type",))
+    events.labels("INFO").inc()
+    events.labels("INFO").inc()
+    events.labels("CHEAT DETECTED").inc()
+    text = registry.render()
+    assert "# TYPE test_events_total counter" in text
+    assert 'test_events_total{type="INFO"} 2' in text
+    assert 'test_events_total{type="CHEAT DETECTED"} 1' in text
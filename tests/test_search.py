@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import pytest
+
+from events import EventStore, INFO, WARNING, ALERT
+from search import EventIndex, EventView, clock_time
+
+T0 = datetime(2026, 3, 2, 10, 0, 0).timestamp()
+
+EVENTS = [
+    (0, "INFO", "Monitoring started", INFO),
+    (30, "WARNING", "Face not centered", WARNING),
+    (60, "AI ALERT", "Window switch shortcut (Alt+Tab)", ALERT),
+    (90, "WARNING", "Face not centered", WARNING),
+    (120, "AI ALERT", "Copied and pasted text", ALERT),
+    (150, "INFO", "Window focus: Notepad", INFO),
+]
+
+
+def build(events=EVENTS):
+    store = EventStore()
+    for offset, event_type, message, severity in events:
+        store.append(event_type, message, timestamp=T0 + offset, severity=severity)
+    return store, EventIndex(store, capacity=2)
+
+
+def test_no_conditions_returns_everything():
+    _, index = build()
+    assert index.query().tolist() == list(range(len(EVENTS)))
+
+
+def test_time_range():
+    _, index = build()
+    assert index.query(since=T0 + 30, until=T0 + 120).tolist() == [1, 2, 3]
+    assert index.query(since=T0 + 1000).tolist() == []
+
+
+def test_time_range_out_of_order():
+    events = EVENTS[:3] + [(-10, "INFO", "Late clock", INFO)]
+    _, index = build(events)
+    assert index.query(since=T0 + 20).tolist() == [1, 2]
+    assert not index.stats()["ordered"]
+
+
+def test_event_types_and_severities():
+    _, index = build()
+    assert index.query(event_types=["WARNING"]).tolist() == [1, 3]
+    assert index.query(event_types=["NEVER LOGGED"]).tolist() == []
+    assert index.query(severities=[ALERT]).tolist() == [2, 4]
+    assert index.query(event_types=["INFO", "AI ALERT"], severities=[INFO]).tolist() == [0, 5]
+
+
+def test_words_match_messages_and_types():
+    _, index = build()
+    assert index.query("face centered ").tolist() == [1, 3]
+    assert index.query("ai ").tolist() == [2, 4]
+    assert index.query("window ").tolist() == [2, 5]
+    assert index.query("window alert ").tolist() == [2]
+
+
+def test_last_word_matches_as_prefix():
+    _, index = build()
+    assert index.query("cop").tolist() == [4]
+    assert index.query("cop ").tolist() == []
+
+
+def test_combined_conditions():
+    _, index = build()
+    assert index.query("window", since=T0 + 100, severities=[INFO]).tolist() == [5]
+
+
+def test_index_follows_new_events():
+    store, index = build()
+    assert index.query("screenshot").tolist() == []
+    store.append("AI ALERT", "Screenshot key (Print Screen)", timestamp=T0 + 200, severity=ALERT)
+    assert index.query("screenshot").tolist() == [6]
+    assert index.event_types() == ["AI ALERT", "INFO", "WARNING"]
+
+
+def test_event_view():
+    store, index = build()
+    view = EventView(store, index.query(event_types=["WARNING"]))
+    assert len(view) == 2
+    assert view[1].index == 3 and view[1].message == "Face not centered"
+
+
+def test_clock_time():
+    assert clock_time("", T0) is None
+    assert clock_time("10:01", T0) == T0 + 60
+    assert clock_time("10:01", T0, end=True) == T0 + 120
+    assert clock_time("10:01:30", T0, end=True) == T0 + 91
+    with pytest.raises(ValueError):
+        clock_time("10", T0)
+
+
+def test_types_logged_after_many_distinct_messages():
+    events = [(n, "INFO", f"Window changed to: w{n}", INFO) for n in range(300)]
+    events += [(300, "CHEAT DETECTED", "Phone visible", ALERT), (301, "WARNING", "Window changed to: w5", WARNING)]
+    store, index = build(events)
+    assert store.string_id("CHEAT DETECTED") > 255
+    assert index.query(event_types=["CHEAT DETECTED"]).tolist() == [300]
+    assert index.query("cheat").tolist() == [300]
+    assert index.query("w5 ").tolist() == [5, 301]
+    assert index.query("w5", event_types=["WARNING"]).tolist() == [301]
+    assert "CHEAT DETECTED" in index.event_types()
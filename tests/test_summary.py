@@ -0,0 +1,51 @@
+from summary import SummaryJob, FakeSummaryModel
+
+
+def test_streams_the_whole_text():
+    model = FakeSummaryModel(text="**Report**\n- All clear\n" * 5, chunk_size=7, delay=0)
+    job = SummaryJob(model, "prompt").start()
+    text = job.wait(5)
+    assert job.state == SummaryJob.DONE
+    assert text == job.text == model.text
+    assert model.prompts == ["prompt"]
+    assert job.first_chunk_after is not None
+
+
+def test_poll_only_returns_new_text():
+    model = FakeSummaryModel(text="abcdef", chunk_size=2, delay=0)
+    job = SummaryJob(model, "prompt").start()
+    assert job.wait(5) == "abcdef"
+    assert job.poll() == ""
+
+
+def test_cancel_stops_the_stream():
+    model = FakeSummaryModel(text="x" * 400, chunk_size=10, delay=0.02)
+    job = SummaryJob(model, "prompt").start()
+    job.cancel()
+    job.wait(5)
+    assert job.state == SummaryJob.CANCELLED
+    assert len(job.text) < len(model.text)
+
+
+def test_timeout_is_enforced_from_poll():
+    model = FakeSummaryModel(text="x" * 100, chunk_size=10, delay=0.5)
+    job = SummaryJob(model, "prompt", timeout=0.1).start()
+    job._thread.join(0.3)
+    job.poll()
+    assert job.state == SummaryJob.TIMEOUT
+    assert isinstance(job.error, TimeoutError)
+
+
+def test_model_errors_are_reported():
+    model = FakeSummaryModel(delay=0, fail_with=RuntimeError("quota"))
+    job = SummaryJob(model, "prompt").start()
+    job.wait(5)
+    assert job.state == SummaryJob.ERROR
+    assert str(job.error) == "quota"
+    assert job.text == ""
+
+
+def test_completed_job_replays_text():
+    job = SummaryJob.completed("saved summary")
+    assert job.state == SummaryJob.DONE and not job.running
+    assert job.poll() == "saved summary"
@@ -0,0 +1,116 @@
+import time
+
+import cv2
+
+
+class FaceTracker:
+    """Detect-then-track wrapper around a face detector (see detectors.py)
+
+    Once a face has been found, later frames are only searched in a padded
+    window around the previous box. That window is downscaled so the face is
+    roughly `track_face_size` pixels wide, and min/max sizes are derived from
+    the previous detection, which makes each tracked pass a small fraction of
+    a full 800x600 scan. A full-frame scan still runs every `rescan_interval`
+    frames or as soon as the face is lost. Detectors without cheap region
+    search (`supports_roi` false) get a full scan on every call.
+    """
+
+    def __init__(self, detector, rescan_interval=15, padding=0.6, track_face_size=64,
+                 size_tolerance=0.35):
+        self.detector = detector
+        self.rescan_interval = rescan_interval if detector.supports_roi else 0
+        self.padding = padding
+        self.track_face_size = track_face_size
+        self.size_tolerance = size_tolerance
+        self.last_box = None
+        self.frames_since_full = 0
+
+        self.started = time.perf_counter()
+        self.calls = 0
+        self.full_scans = 0
+        self.tracked_scans = 0
+        self.track_losses = 0
+        self.full_time = 0.0
+        self.tracked_time = 0.0
+        self.full_pixels = 0
+        self.scanned_pixels = 0
+
+    def reset(self):
+        self.last_box = None
+        self.frames_since_full = 0
+
+    def detect(self, gray, frame=None):
+        """Return faces as (x, y, w, h) in full-frame coordinates, best match first
+
+        `frame` is the BGR image `gray` came from, for detectors that use colour.
+        """
+        self.calls += 1
+        self.full_pixels += gray.shape[0] * gray.shape[1]
+
+        faces = None
+        if self.last_box is not None and self.frames_since_full < self.rescan_interval:
+            faces = self._track(gray)
+            if not faces:
+                self.track_losses += 1
+
+        if not faces:
+            faces = self._full_scan(gray, frame)
+            self.frames_since_full = 0
+        else:
+            self.frames_since_full += 1
+
+        self.last_box = faces[0] if faces else None
+        return faces
+
+    def _full_scan(self, gray, frame=None):
+        start = time.perf_counter()
+        found = self.detector.detect(gray, frame)
+        self.full_time += time.perf_counter() - start
+        self.full_scans += 1
+        self.scanned_pixels += gray.shape[0] * gray.shape[1]
+        return found
+
+    def _track(self, gray):
+        x, y, w, h = self.last_box
+        frame_h, frame_w = gray.shape[:2]
+        pad_x, pad_y = int(w * self.padding), int(h * self.padding)
+        x0, y0 = max(0, x - pad_x), max(0, y - pad_y)
+        x1, y1 = min(frame_w, x + w + pad_x), min(frame_h, y + h + pad_y)
+        if x1 - x0 < w or y1 - y0 < h:
+            return []
+
+        start = time.perf_counter()
+        roi = gray[y0:y1, x0:x1]
+        scale = min(1.0, self.track_face_size / float(w))
+        if scale < 1.0:
+            roi = cv2.resize(roi, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        min_side = max(20, int(w * scale * (1 - self.size_tolerance)))
+        max_side = int(w * scale * (1 + self.size_tolerance)) + 1
+        found = self.detector.detect(roi, min_size=min_side, max_size=max_side)
+        self.tracked_time += time.perf_counter() - start
+        self.tracked_scans += 1
+        self.scanned_pixels += roi.shape[0] * roi.shape[1]
+
+        faces = [(int(x0 + fx / scale), int(y0 + fy / scale), int(fw / scale), int(fh / scale))
+                 for fx, fy, fw, fh in found]
+        cx, cy = x + w / 2, y + h / 2
+        faces.sort(key=lambda f: (f[0] + f[2] / 2 - cx) ** 2 + (f[1] + f[3] / 2 - cy) ** 2)
+        return faces
+
+    def stats(self):
+        """Throughput and an estimate of the detection cost saved by tracking"""
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        spent = self.full_time + self.tracked_time
+        avg_full = self.full_time / self.full_scans if self.full_scans else 0.0
+        # What the same number of calls would have cost as full-frame scans
+        baseline = avg_full * self.calls
+        return {
+            "detections_per_sec": self.calls / elapsed,
+            "full_scans": self.full_scans,
+            "tracked_scans": self.tracked_scans,
+            "track_losses": self.track_losses,
+            "avg_full_ms": avg_full * 1000,
+            "avg_tracked_ms": (self.tracked_time / self.tracked_scans * 1000) if self.tracked_scans else 0.0,
+            "pixels_saved": 1 - self.scanned_pixels / self.full_pixels if self.full_pixels else 0.0,
+            "cost_saved": 1 - spent / baseline if baseline else 0.0,
+        }
@@ -0,0 +1,136 @@
+import customtkinter as ctk
+
+from events import SEVERITY_COLORS
+
+
+class VirtualLogList(ctk.CTkFrame):
+    """Scrollable event list that only owns widgets for the rows on screen
+
+    Rows have a fixed height, so the visible window is just a start index and
+    a row count. Scrolling rebinds the text and colour of a small pool of row
+    frames instead of creating or moving widgets, which keeps opening and
+    scrolling constant-time whether the source holds ten events or a million.
+    `source` needs `len()` and integer indexing that returns Event records;
+    set_source() swaps it, e.g. for a filtered view.
+    """
+
+    def __init__(self, master, source, row_height=44, font_size=16,
+                 message_width=900, follow=True, **kwargs):
+        super().__init__(master, **kwargs)
+        self.source = source
+        self.row_height = row_height
+        self.font_size = font_size
+        self.message_width = message_width
+        self.follow = follow
+        self.first = 0
+        self.rows = []
+        self._bound = []
+
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.body.bind("<Configure>", self._on_resize)
+        for widget in (self, self.body):
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+            widget.bind("<Button-4>", lambda e: self.scroll_by(-3))
+            widget.bind("<Button-5>", lambda e: self.scroll_by(3))
+
+    @property
+    def visible_rows(self):
+        return max(1, self.body.winfo_height() // self.row_height)
+
+    def _make_row(self):
+        frame = ctk.CTkFrame(self.body, corner_radius=8, height=self.row_height - 6)
+        frame.pack_propagate(False)
+        time_label = ctk.CTkLabel(frame, text="", width=150,
+                                  font=("Consolas", self.font_size, "bold"))
+        time_label.pack(side="left", padx=15)
+        type_label = ctk.CTkLabel(frame, text="", width=220, text_color="#ffffff",
+                                  font=("Arial", self.font_size, "bold"))
+        type_label.pack(side="left", padx=15)
+        message_label = ctk.CTkLabel(frame, text="", anchor="w", justify="left",
+                                     font=("Arial", self.font_size), width=self.message_width)
+        message_label.pack(side="left", padx=15, fill="x", expand=True)
+        for widget in (frame, time_label, type_label, message_label):
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+            widget.bind("<Button-4>", lambda e: self.scroll_by(-3))
+            widget.bind("<Button-5>", lambda e: self.scroll_by(3))
+        # Packed lazily by refresh(); unbound rows always form a suffix so order is kept
+        self.rows.append((frame, time_label, type_label, message_label))
+        self._bound.append(None)
+
+    def _on_resize(self, event=None):
+        while len(self.rows) < self.visible_rows:
+            self._make_row()
+        self.refresh()
+
+    def _on_mousewheel(self, event):
+        self.scroll_by(-1 if event.delta > 0 else 1)
+
+    def _on_scrollbar(self, action, *args):
+        total = len(self.source)
+        if action == "moveto":
+            self.scroll_to(int(float(args[0]) * total))
+        elif action == "scroll":
+            step = int(args[0]) * (self.visible_rows if args[1] == "pages" else 1)
+            self.scroll_by(step)
+
+    def _max_first(self):
+        return max(0, len(self.source) - self.visible_rows)
+
+    def scroll_to(self, index):
+        self.first = min(max(0, index), self._max_first())
+        self.follow = self.first == self._max_first()
+        self.refresh()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.first + rows)
+
+    def scroll_to_end(self):
+        self.follow = True
+        self.refresh()
+
+    def set_source(self, source, follow=False):
+        """Show a different source (such as search results) from its first row"""
+        self.source = source
+        self.first = 0
+        self.follow = follow
+        self.invalidate()
+
+    def invalidate(self):
+        """Rebind every visible row, for when the source changed under the same indices"""
+        self._bound = [None if index is None else -1 for index in self._bound]
+        self.refresh()
+
+    def refresh(self):
+        total = len(self.source)
+        visible = self.visible_rows
+        if self.follow:
+            self.first = max(0, total - visible)
+        self.first = min(self.first, max(0, total - visible))
+
+        for slot, row in enumerate(self.rows):
+            index = self.first + slot
+            frame, time_label, type_label, message_label = row
+            if slot >= visible or index >= total:
+                if self._bound[slot] is not None:
+                    frame.pack_forget()
+                    self._bound[slot] = None
+                continue
+            if self._bound[slot] == index:
+                continue
+            event = self.source[index]
+            if self._bound[slot] is None:
+                frame.pack(fill="x", pady=3, padx=5)
+            frame.configure(fg_color=SEVERITY_COLORS[event.severity])
+            time_label.configure(text=event.time_text)
+            type_label.configure(text=event.event_type)
+            message_label.configure(text=event.message)
+            self._bound[slot] = index
+
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)